@@ -1,5 +1,6 @@
 """Gmail app password authentication setup."""
 
+import argparse
 import logging
 import os
 import sys
@@ -69,10 +70,8 @@ def setup_app_password(
     return config_data
 
 
-def main():
-    """Run the Gmail app password setup tool."""
-    import argparse
-    
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser for the setup tool."""
     parser = argparse.ArgumentParser(description="Configure Gmail with app password")
     parser.add_argument(
         "--username", 
@@ -93,7 +92,17 @@ def main():
         help="Path to save the updated config file (default: config.yaml)",
         default="config.yaml",
     )
+    return parser
+
+
+def main(parser: Optional[argparse.ArgumentParser] = None):
+    """Run the Gmail app password setup tool.
     
+    Args:
+        parser: Argument parser to use; built with _build_parser() if None.
+            Lets callers such as tests reuse one parser across runs.
+    """
+    parser = parser or _build_parser()
     args = parser.parse_args()
     
     # Configure logging
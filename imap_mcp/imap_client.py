@@ -3,6 +3,7 @@
 import email
 import logging
 import re
+import ssl
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Union
 
@@ -18,33 +19,56 @@ logger = logging.getLogger(__name__)
 class ImapClient:
     """IMAP client for interacting with email servers."""
     
-    def __init__(self, config: ImapConfig, allowed_folders: Optional[List[str]] = None):
+    def __init__(
+        self,
+        config: ImapConfig,
+        allowed_folders: Optional[List[str]] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
         """Initialize IMAP client.
         
         Args:
             config: IMAP configuration
             allowed_folders: List of allowed folders (None means all folders)
+            ssl_context: SSL context to connect with (None means imapclient's
+                default); sharing one between clients avoids reloading the CA
+                certificates on every connection
         """
         self.config = config
         self.allowed_folders = set(allowed_folders) if allowed_folders else None
+        self.ssl_context = ssl_context
         self.client = None
         self.folder_cache: Dict[str, List[str]] = {}
         self.connected = False
         self.count_cache: Dict[str, Dict[str, Tuple[int, datetime]]] = {}  # Cache for message counts
         self.current_folder = None  # Store the currently selected folder
+        self.last_select_response: Optional[Dict] = None  # Untagged SELECT response for current_folder
         self.folder_message_counts = {}  # Cache for folder message counts
     
-    def connect(self) -> None:
+    def connect(self, timeout: Optional[float] = None) -> None:
         """Connect to IMAP server.
         
+        Args:
+            timeout: Socket timeout in seconds for connecting and for each
+                read (None means no timeout)
+        
         Raises:
-            ConnectionError: If connection fails
+            ConnectionError: If connection fails; the original error is
+                chained as its __cause__
         """
         try:
+            # Only pass the optional settings that were given, so imapclient
+            # keeps its own defaults otherwise
+            client_kwargs = {}
+            if self.ssl_context:
+                client_kwargs["ssl_context"] = self.ssl_context
+            if timeout is not None:
+                client_kwargs["timeout"] = timeout
             self.client = imapclient.IMAPClient(
                 self.config.host, 
                 port=self.config.port, 
                 ssl=self.config.use_ssl,
+                **client_kwargs,
             )
             
             # Use OAuth2 for Gmail if configured
@@ -72,7 +96,7 @@ class ImapClient:
         except Exception as e:
             self.connected = False
             logger.error(f"Failed to connect to IMAP server: {e}")
-            raise ConnectionError(f"Failed to connect to IMAP server: {e}")
+            raise ConnectionError(f"Failed to connect to IMAP server: {e}") from e
     
     def disconnect(self) -> None:
         """Disconnect from IMAP server."""
@@ -84,6 +108,7 @@ class ImapClient:
             finally:
                 self.client = None
                 self.connected = False
+                self.last_select_response = None
                 logger.info("Disconnected from IMAP server")
     
     def ensure_connected(self) -> None:
@@ -190,12 +215,56 @@ class ImapClient:
         try:
             result = self.client.select_folder(folder, readonly=readonly)
             self.current_folder = folder
+            self.last_select_response = result
             logger.debug(f"Selected folder '{folder}'")
             return result
         except imapclient.IMAPClient.Error as e:
             logger.error(f"Error selecting folder {folder}: {e}")
             raise ConnectionError(f"Failed to select folder {folder}: {e}")
     
+    def get_folder_counts(self, folder: str, refresh: bool = False) -> Tuple[int, int, int]:
+        """Get total, unread and read message counts for a folder.
+        
+        All three counts come from a single STATUS command and are cached
+        until refresh is requested.
+        
+        Args:
+            folder: Folder to count messages in
+            refresh: Force refresh of the cached counts
+            
+        Returns:
+            Tuple of (total, unread, read) message counts
+            
+        Raises:
+            ValueError: If folder is not allowed
+            ConnectionError: If connection fails or the STATUS command fails
+        """
+        if not self._is_folder_allowed(folder):
+            raise ValueError(f"Folder '{folder}' is not allowed")
+        
+        # Check cache first
+        cached = self.count_cache.get(folder)
+        if not refresh and cached:
+            return cached["total"][0], cached["unread"][0], cached["read"][0]
+        
+        self.ensure_connected()
+        try:
+            status = self.client.folder_status(folder, [b"MESSAGES", b"UNSEEN"])
+        except Exception as e:
+            logger.error(f"Error getting message counts for folder {folder}: {e}")
+            raise ConnectionError(f"Failed to get message counts for folder {folder}: {e}") from e
+        total = status.get(b"MESSAGES", 0)
+        unread = status.get(b"UNSEEN", 0)
+        read = max(0, total - unread)
+        
+        now = datetime.now()
+        self.count_cache[folder] = {
+            "total": (total, now),
+            "unread": (unread, now),
+            "read": (read, now),
+        }
+        return total, unread, read
+    
     def search(
         self, 
         criteria: Union[str, List, Tuple],
@@ -45,6 +45,9 @@ VALID_STATUS_TRANSITIONS = {
 # Define the display order of statuses for visual representation
 STATUS_ORDER = ['prioritized', 'in-progress', 'in-review', 'completed', 'reopened', 'canceled']
 
+# Commit actions that mark an issue as completed (singular forms included)
+CLOSE_ACTIONS = frozenset({'fixes', 'closes', 'resolves', 'fix', 'close', 'resolve'})
+
 # GitHub CLI wrapper functions
 def gh_get_issue(owner: str, repo: str, issue_number: int) -> Dict:
     """
@@ -1206,7 +1209,7 @@ def main():
             action = parsed['action']
             status = None
             
-            if action == 'closes' or action == 'fixes' or action == 'resolves':
+            if action in CLOSE_ACTIONS:
                 status = 'completed'
             elif action == 'implements':
                 status = 'in-progress'
@@ -1394,9 +1397,9 @@ def update_single_issue(
             logger.info(f"  - Analyzing commit: {commit.get('hash')}")
             logger.info(f"    Action: {action}")
             logger.info(f"    Issue refs: {issue_refs}")
-            logger.info(f"    Is completing commit: {action in ('fixes', 'closes', 'resolves') and issue_number in issue_refs}")
+            logger.info(f"    Is completing commit: {action in CLOSE_ACTIONS and issue_number in issue_refs}")
             
-            if action in ('fixes', 'closes', 'resolves') and issue_number in issue_refs:
+            if action in CLOSE_ACTIONS and issue_number in issue_refs:
                 found_completing_commit = True
                 # Run tests to confirm
                 test_results = test_analyzer.run_tests_for_issue(issue_number)
@@ -25,8 +25,6 @@ from pathlib import Path
 from typing import Dict, Optional
 
 import yaml
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -119,6 +117,9 @@ def refresh_token(credentials: Dict) -> Dict:
     Returns:
         Dictionary with new tokens
     """
+    # Imported lazily so --help and config errors don't pay for google-auth
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     # Create client config expected by google-auth-oauthlib
     client_config = {
         'installed': {
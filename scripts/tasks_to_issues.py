@@ -18,6 +18,17 @@ from pathlib import Path
 import json
 
 
+# Matches the task tracker table; each column is bounded to a single line so
+# malformed tables cannot cause runaway backtracking
+TABLE_PATTERN = re.compile(
+    r'\|\s*Priority\s*\|\s*Task #\s*\|\s*Status\s*\|\s*Description\s*\|\s*\n\|[-\s|]*\n'
+    r'((?:\|[^|\n]*\|[^|\n]*\|[^|\n]*\|[^|\n]*\|[ \t]*\n)+)'
+)
+
+# Matches each "#### N. Title" task section up to the next heading or EOF
+TASK_SECTION_PATTERN = re.compile(r'#### (\d+)\. .*?(?=####|\Z)', re.DOTALL)
+
+
 class TaskParser:
     """Parse tasks from TASKS.md file."""
 
@@ -46,8 +57,7 @@ class TaskParser:
             return []
 
         # Extract the task table
-        table_pattern = r'\|\s*Priority\s*\|\s*Task #\s*\|\s*Status\s*\|\s*Description\s*\|\s*\n\|[-\s|]*\n((?:\|[^|]*\|[^|]*\|[^|]*\|[^|]*\|\s*\n)+)'
-        table_match = re.search(table_pattern, content)
+        table_match = TABLE_PATTERN.search(content)
         
         if not table_match:
             print("Could not find task table in TASKS.md")
@@ -55,6 +65,12 @@ class TaskParser:
         
         task_table = table_match.group(1)
         
+        # Index detailed task descriptions in a single pass over the file,
+        # keeping the first section found for each task number
+        details_map = {}
+        for section_match in TASK_SECTION_PATTERN.finditer(content):
+            details_map.setdefault(int(section_match.group(1)), section_match.group(0).strip())
+        
         # Parse table rows
         tasks = []
         for line in task_table.strip().split('\n'):
@@ -78,13 +94,8 @@ class TaskParser:
                 print(f"Skipping row with invalid priority or task number: {line}")
                 continue
                 
-            # Find detailed task description
-            task_pattern = rf'#### {task_number}\. .*?(?=####|\Z)'
-            task_detail_match = re.search(task_pattern, content, re.DOTALL)
-            
-            task_details = ""
-            if task_detail_match:
-                task_details = task_detail_match.group(0).strip()
+            # Look up detailed task description
+            task_details = details_map.get(task_number, "")
             
             tasks.append({
                 'task_number': task_number,
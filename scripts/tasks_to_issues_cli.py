@@ -5,7 +5,7 @@ Simplified task migration script using GitHub CLI (gh) to transition from TASKS.
 This script:
 1. Creates necessary labels in GitHub repo
 2. Parses TASKS.md to extract tasks
-3. Uses 'gh issue create' to create corresponding GitHub issues
+3. Creates corresponding GitHub issues through the GitHub API, authenticated with the gh token
 4. Provides a simple one-step migration process
 
 Requirements: 
@@ -13,28 +13,126 @@ Requirements:
 - Run from the root of the repository
 """
 
-import re
 import os
 import sys
 import argparse
+import concurrent.futures
+import functools
 import subprocess
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
 
+import requests
+
+
+# Column headings of the task tracker table in TASKS.md
+TABLE_HEADER = ['Priority', 'Task #', 'Status', 'Description']
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+
+# Issues created per GraphQL mutation and number of mutations sent in parallel
+ISSUE_BATCH_SIZE = 20
+MAX_ISSUE_WORKERS = 4
+
+# Minimum seconds between the starts of two issue-creating mutations; GitHub
+# asks clients to pace requests that create content
+MUTATION_INTERVAL = 1.0
+
+# Retries for requests rejected by a rate limit, and the wait before the first
+# retry when GitHub does not send Retry-After (doubled on every attempt)
+MAX_RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 60.0
+
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    id
+    labels(first: 100, after: $cursor) {
+      nodes { id name }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
 
 def run_command(cmd, capture_output=True):
-    """Run a shell command and return the output."""
-    result = subprocess.run(cmd, shell=True, text=True, capture_output=capture_output)
+    """
+    Run a command and return the output.
+    
+    Args:
+        cmd: Command to run as a list of strings (no shell is involved)
+        capture_output: If True, return stdout instead of True on success
+    """
+    try:
+        result = subprocess.run(cmd, text=True, capture_output=capture_output)
+    except FileNotFoundError as e:
+        print(f"Error running command: {' '.join(cmd)}")
+        print(f"Error: {e}")
+        return None
     if result.returncode != 0:
-        print(f"Error running command: {cmd}")
+        print(f"Error running command: {' '.join(cmd)}")
         print(f"Error: {result.stderr}")
         return None
     return result.stdout.strip() if capture_output else True
 
 
-def create_required_labels():
-    """Create all required GitHub labels for task tracking."""
+def create_github_session():
+    """
+    Create an HTTP session authenticated with the GitHub CLI token.
+    
+    Reusing one session keeps a single keep-alive connection to the GitHub API
+    instead of paying process startup and TLS setup for every gh invocation.
+    
+    Returns:
+        Tuple of (requests.Session, "owner/repo") or None if gh is not usable
+    """
+    token = run_command(["gh", "auth", "token"])
+    if not token:
+        return None
+    
+    repo = run_command(["gh", "repo", "view", "--json", "nameWithOwner", "--jq", ".nameWithOwner"])
+    if not repo:
+        return None
+    
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+    })
+    return session, repo
+
+
+def clone_github_session(session):
+    """
+    Create a new session that sends the same headers as an existing one.
+    
+    requests.Session is not thread-safe, so worker threads use a clone with the
+    same authentication instead of sharing the caller's session.
+    """
+    clone = requests.Session()
+    clone.headers.update(session.headers)
+    return clone
+
+
+def create_required_labels(github=None):
+    """
+    Create all required GitHub labels for task tracking.
+    
+    Args:
+        github: Optional (session, repo) tuple from create_github_session
+    """
     print("Creating required GitHub labels...")
     
+    if github is None:
+        github = create_github_session()
+    if github is None:
+        print("Could not set up GitHub API session; skipping label creation")
+        return False
+    session, repo = github
+    
     # Define status labels
     status_labels = [
         {"name": "status:prioritized", "color": "0075ca", "description": "Task is prioritized but not started"},
@@ -53,102 +151,351 @@ def create_required_labels():
     # Combine all labels
     all_labels = status_labels + priority_labels
     
-    # Create each label
+    # Create each label over the shared connection
+    labels_url = f"{GITHUB_API_URL}/repos/{repo}/labels"
     created_count = 0
     for label in all_labels:
-        cmd = f'gh label create "{label["name"]}" --color "{label["color"]}" --description "{label["description"]}" || true'
-        if run_command(cmd, capture_output=False):
+        try:
+            response = session.post(labels_url, json=label)
+        except requests.RequestException as e:
+            print(f"Error creating label {label['name']}: {e}")
+            continue
+        
+        # 422 means the label already exists
+        if response.status_code in (201, 422):
             created_count += 1
+        else:
+            print(f"Error creating label {label['name']}: {response.status_code} {response.text}")
     
     print(f"Created or confirmed {created_count} labels")
     return created_count > 0
 
 
-def parse_tasks(tasks_file='TASKS.md'):
+def parse_task_row(line):
     """
-    Parse tasks from TASKS.md file.
+    Parse one row of the task table.
+    
+    Returns:
+        Task dictionary, or None for completed tasks and malformed rows
+    """
+    columns = [col.strip() for col in line.split('|')[1:-1]]
+    if len(columns) != 4:
+        return None
+        
+    priority, task_number, status, description = columns
+    
+    # Skip tasks that are already completed
+    if status.lower() == 'completed':
+        return None
+        
+    try:
+        return {
+            'priority': int(priority),
+            'task_number': int(task_number.strip()),
+            'status': status,
+            'description': description,
+        }
+    except ValueError:
+        # Skip entries that don't have proper number values
+        return None
+
+
+def read_tasks(tasks_file):
+    """
+    Read and parse tasks from TASKS.md file without caching.
+    
+    The file is read line by line and only the task table is kept, so memory
+    use does not grow with the size of the rest of the document.
     
     Returns:
         List of dictionaries with task information
     """
+    tasks = []
+    in_table = False
     try:
         with open(tasks_file, 'r') as f:
-            content = f.read()
+            header_seen = False
+            for line in f:
+                line = line.strip()
+                if in_table:
+                    # The table ends at the first line that is not a row
+                    if not line.startswith('|'):
+                        break
+                    task = parse_task_row(line)
+                    if task:
+                        tasks.append(task)
+                elif header_seen and line.startswith('|') and not line.strip('|-: \t'):
+                    # Separator line right after the header starts the table
+                    in_table = True
+                else:
+                    header_seen = [col.strip() for col in line.split('|')[1:-1]] == TABLE_HEADER
     except Exception as e:
         print(f"Error reading tasks file: {e}")
         return []
     
-    # Extract the task table
-    table_pattern = r'\|\s*Priority\s*\|\s*Task #\s*\|\s*Status\s*\|\s*Description\s*\|\s*\n\|[-\s|]*\n((?:\|[^|]*\|[^|]*\|[^|]*\|[^|]*\|\s*\n)+)'
-    table_match = re.search(table_pattern, content)
-    
-    if not table_match:
+    if not in_table:
         print("Could not find task table in TASKS.md")
         return []
     
-    table_content = table_match.group(1)
-    
-    # Extract tasks from table
-    tasks = []
-    for line in table_content.strip().split('\n'):
-        if not line.startswith('|'):
-            continue
-            
-        columns = [col.strip() for col in line.split('|')[1:-1]]
-        if len(columns) != 4:
-            continue
-            
-        priority, task_number, status, description = columns
-        
-        # Skip tasks that are already completed
-        if status.lower() == 'completed':
-            continue
-            
-        try:
-            task = {
-                'priority': int(priority),
-                'task_number': int(task_number.strip()),
-                'status': status,
-                'description': description,
-            }
-            tasks.append(task)
-        except ValueError:
-            # Skip entries that don't have proper number values
-            continue
-    
     # Sort tasks by priority
     tasks.sort(key=lambda x: x['priority'])
     return tasks
 
 
-def create_issue_with_gh(task):
-    """Create GitHub issue using gh CLI."""
-    title = f"Task #{task['task_number']}: {task['description']}"
+@functools.lru_cache(maxsize=8)
+def _parse_tasks_cached(tasks_file, mtime_ns, size):
+    """Parse tasks once per (path, mtime, size) combination."""
+    return tuple(read_tasks(tasks_file))
+
+
+def parse_tasks(tasks_file='TASKS.md'):
+    """
+    Parse tasks from TASKS.md file.
+    
+    Results are cached on the file's modification time and size, so repeated
+    calls for an unchanged file skip re-parsing.
+    
+    Returns:
+        List of dictionaries with task information
+    """
+    try:
+        stat = os.stat(tasks_file)
+    except OSError:
+        # Let the uncached reader report the error
+        return read_tasks(tasks_file)
+    
+    # Hand out copies so callers cannot modify the cached tasks
+    return [dict(task) for task in _parse_tasks_cached(tasks_file, stat.st_mtime_ns, stat.st_size)]
+
+
+def build_issue_body(task):
+    """Build the GitHub issue body for a task."""
+    return "\n".join([
+        "## Original Task Information",
+        "",
+        f"- Priority: {task['priority']}",
+        f"- Task Number: {task['task_number']}",
+        f"- Original Status: {task['status']}",
+        "",
+        "## Description",
+        "",
+        task['description'],
+        "",
+        "",
+    ])
+
+
+def rate_limit_delay(response, attempt):
+    """
+    Work out how long to wait before retrying a rate-limited request.
+    
+    Args:
+        response: Response from the GitHub API
+        attempt: Number of retries already made for this request
+        
+    Returns:
+        Seconds to wait, or None if the response is not a rate limit rejection
+    """
+    retry_after = response.headers.get("Retry-After")
+    if response.status_code == 403:
+        # A plain 403 is a permission error; only retry GitHub's rate limits
+        if retry_after is None and response.headers.get("X-RateLimit-Remaining") != "0":
+            return None
+    elif response.status_code != 429:
+        return None
+    
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return RATE_LIMIT_BACKOFF * 2 ** attempt
+
+
+class RequestPacer:
+    """Keep a minimum interval between requests sent from several threads."""
     
-    # Build the body with task information
-    body = f"## Original Task Information\n\n"
-    body += f"- Priority: {task['priority']}\n"
-    body += f"- Task Number: {task['task_number']}\n"
-    body += f"- Original Status: {task['status']}\n\n"
-    body += f"## Description\n\n{task['description']}\n\n"
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
     
-    # Create labels - use multiple --label parameters instead of comma-separated
-    priority_label = f"priority:{task['priority']}"
-    status_label = f"status:{task['status'].lower()}"
+    def wait(self):
+        """Block until the next request may start."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def graphql_request(session, query, variables, pacer=None):
+    """
+    Send a GraphQL request to the GitHub API.
     
-    # Build the gh command
-    cmd = f'gh issue create --title "{title}" --body "{body}" --label "{priority_label}" --label "{status_label}"'
+    Requests rejected by a rate limit are retried up to MAX_RATE_LIMIT_RETRIES
+    times after the delay GitHub asks for.
     
-    # Run the command
-    print(f"Creating issue: {title}")
-    result = run_command(cmd)
+    Args:
+        session: Authenticated requests.Session
+        query: GraphQL query or mutation
+        variables: Variables for the query
+        pacer: Optional RequestPacer to wait on before every attempt
     
-    if result:
-        print(f"Created issue: {result}")
-        return True
-    else:
-        print(f"Failed to create issue for task #{task['task_number']}")
-        return False
+    Returns:
+        The "data" member of the response, or None on error
+    """
+    attempt = 0
+    try:
+        while True:
+            if pacer is not None:
+                pacer.wait()
+            response = session.post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables})
+            delay = rate_limit_delay(response, attempt)
+            if delay is None or attempt >= MAX_RATE_LIMIT_RETRIES:
+                break
+            attempt += 1
+            print(f"GitHub rate limit hit; retrying in {delay:.0f}s ({attempt}/{MAX_RATE_LIMIT_RETRIES})")
+            time.sleep(delay)
+        response.raise_for_status()
+        result = response.json()
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error calling GitHub GraphQL API: {e}")
+        return None
+    
+    for error in result.get("errors", []):
+        print(f"GraphQL error: {error.get('message')}")
+    return result.get("data")
+
+
+def resolve_repository(session, repo):
+    """
+    Resolve the repository node ID and the node IDs of all its labels.
+    
+    Labels are returned 100 per page, so the query is repeated with the end
+    cursor until the last page has been read.
+    
+    Returns:
+        Tuple of (repository ID, mapping of label name to label ID), or None on error
+    """
+    owner, name = repo.split("/", 1)
+    label_ids = {}
+    cursor = None
+    while True:
+        data = graphql_request(session, REPOSITORY_QUERY, {"owner": owner, "name": name, "cursor": cursor})
+        if not data or not data.get("repository"):
+            print(f"Could not resolve repository {repo}")
+            return None
+        
+        labels = data["repository"]["labels"]
+        label_ids.update((label["name"], label["id"]) for label in labels["nodes"])
+        if not labels["pageInfo"]["hasNextPage"]:
+            return data["repository"]["id"], label_ids
+        cursor = labels["pageInfo"]["endCursor"]
+
+
+def create_issue_batch(session, repository, label_ids, tasks, pacer=None):
+    """
+    Create a batch of issues through one aliased GraphQL mutation.
+    
+    Args:
+        session: Authenticated requests.Session
+        repository: Repository node ID
+        label_ids: Mapping of label name to label node ID
+        tasks: Task dictionaries to create issues for
+        pacer: Optional RequestPacer spacing out the mutations
+        
+    Returns:
+        Number of issues created
+    """
+    # Build one aliased createIssue field per task
+    fields = []
+    declarations = []
+    variables = {}
+    for index, task in enumerate(tasks):
+        alias = f"i{index}"
+        labels = [f"priority:{task['priority']}", f"status:{task['status'].lower()}"]
+        missing = [label for label in labels if label not in label_ids]
+        if missing:
+            print(f"Warning: task #{task['task_number']} is missing label(s) {', '.join(missing)} in the repository")
+        declarations.append(f"${alias}: CreateIssueInput!")
+        fields.append(f"{alias}: createIssue(input: ${alias}) {{ issue {{ number url }} }}")
+        variables[alias] = {
+            "repositoryId": repository,
+            "title": f"Task #{task['task_number']}: {task['description']}",
+            "body": build_issue_body(task),
+            "labelIds": [label_ids[label] for label in labels if label in label_ids],
+        }
+    mutation = f"mutation({', '.join(declarations)}) {{\n  " + "\n  ".join(fields) + "\n}"
+    
+    data = graphql_request(session, mutation, variables, pacer) or {}
+    
+    created_count = 0
+    for index, task in enumerate(tasks):
+        result = data.get(f"i{index}")
+        if result and result.get("issue"):
+            print(f"Created issue: {result['issue']['url']}")
+            created_count += 1
+        else:
+            print(f"Failed to create issue for task #{task['task_number']}")
+    return created_count
+
+
+def bulk_create_issues(tasks, github=None):
+    """
+    Create GitHub issues for all tasks with batched GraphQL mutations.
+    
+    The repository ID and label IDs are resolved up front, then
+    issues are created ISSUE_BATCH_SIZE at a time through aliased createIssue
+    fields. Batches are independent, so a few of them are sent concurrently,
+    each worker thread through its own clone of the session. Mutations start at
+    least MUTATION_INTERVAL seconds apart and are retried when rate limited.
+    
+    Args:
+        tasks: List of task dictionaries from parse_tasks
+        github: Optional (session, repo) tuple from create_github_session
+        
+    Returns:
+        Number of issues created
+    """
+    if not tasks:
+        return 0
+    
+    if github is None:
+        github = create_github_session()
+    if github is None:
+        print("Could not set up GitHub API session; no issues created")
+        return 0
+    session, repo = github
+    
+    resolved = resolve_repository(session, repo)
+    if resolved is None:
+        return 0
+    repository_id, label_ids = resolved
+    
+    batches = [
+        tasks[start:start + ISSUE_BATCH_SIZE]
+        for start in range(0, len(tasks), ISSUE_BATCH_SIZE)
+    ]
+    
+    # Each worker thread posts through its own session; the pool size caps the
+    # mutations in flight and the pacer spaces out their starts
+    local = threading.local()
+    worker_sessions = []
+    pacer = RequestPacer(MUTATION_INTERVAL)
+    
+    def create_batch(batch):
+        if not hasattr(local, "session"):
+            local.session = clone_github_session(session)
+            worker_sessions.append(local.session)
+        return create_issue_batch(local.session, repository_id, label_ids, batch, pacer)
+    
+    print(f"Creating {len(tasks)} issues...")
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_ISSUE_WORKERS, len(batches))) as executor:
+            return sum(executor.map(create_batch, batches))
+    finally:
+        for worker_session in worker_sessions:
+            worker_session.close()
 
 
 def main():
@@ -160,20 +507,20 @@ def main():
     
     args = parser.parse_args()
     
-    # Check if gh CLI is available
-    if not run_command("gh --version", capture_output=True):
-        print("GitHub CLI (gh) is not installed or not in PATH. Please install it and try again.")
-        print("See https://cli.github.com/ for installation instructions.")
-        return 1
-    
-    # Check if gh is authenticated
-    if not run_command("gh auth status", capture_output=False):
-        print("You are not authenticated with GitHub CLI. Please run 'gh auth login' and try again.")
-        return 1
+    # Open one GitHub API session and share it for labels and issues, so the
+    # token lookup and connection setup happen once per run. Reading the token
+    # also verifies that gh is installed and authenticated.
+    github = None
+    if not args.dry_run:
+        github = create_github_session()
+        if github is None:
+            print("Could not get a GitHub token from the GitHub CLI (gh).")
+            print("Make sure gh is installed (see https://cli.github.com/) and run 'gh auth login'.")
+            return 1
     
     # Create required labels
     if not args.skip_labels and not args.dry_run:
-        create_required_labels()
+        create_required_labels(github)
     
     # Parse tasks
     tasks = parse_tasks(args.tasks_file)
@@ -190,10 +537,7 @@ def main():
         for task in tasks:
             print(f"Would create issue for Task #{task['task_number']}: {task['description']}")
     else:
-        created_count = 0
-        for task in tasks:
-            if create_issue_with_gh(task):
-                created_count += 1
+        created_count = bulk_create_issues(tasks, github)
         
         print(f"\nMigration complete! Created {created_count} GitHub issues.")
         print("You can view them by running: gh issue list")
@@ -1,28 +1,35 @@
 """Pytest fixtures for IMAP MCP tests."""
 
+import copy
 import datetime
 import email
 import email.utils
+import functools
+import hashlib
+import io
+import itertools
+import json
 import os
 import re
+import subprocess
 import time
 import logging
 from contextlib import contextmanager
+# email.mime modules are imported inside the fixtures that build messages, so
+# collecting tests that never use them does not pay for the imports
 from email.header import Header
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Generator
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
+import yaml
+
+# Use the LibYAML-backed dumper for fixture files when PyYAML was built with it
 try:
-    from imapclient.response_types import Address, BodyData, Envelope
+    from yaml import CSafeDumper as YamlSafeDumper
 except ImportError:
-    # Mock these classes if not available
-    class Address: pass
-    class BodyData: pass
-    class Envelope: pass
+    from yaml import SafeDumper as YamlSafeDumper
 
 try:
     from dotenv import load_dotenv
@@ -32,11 +39,57 @@ except ImportError:
 from imap_mcp.models import Email, EmailAddress, EmailAttachment, EmailContent
 from imap_mcp.config import ImapConfig, OAuth2Config
 from imap_mcp.imap_client import ImapClient
+from tests.integration.mcp_cli_paths import MCP_CLI_DIR, UV_SYNC_HASH_KEY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Date header used by the email fixtures; fixed so tests are deterministic
+FIXED_DATE = "Thu, 01 Jan 2023 12:00:00 +0000"
+
+# Headers of the canned IMAP response built by make_test_email_response_data
+DEFAULT_RESPONSE_HEADERS = {
+    "From": "Test Sender <sender@example.com>",
+    "To": "Test Recipient <recipient@example.com>",
+    "Subject": "Test Email",
+    "Date": FIXED_DATE,
+    "Message-ID": "<test-123@example.com>"
+}
+DEFAULT_RESPONSE_BODY_TEXT = "This is a test email body."
+
+
+def build_response_body(headers: Dict[str, str], body_text: Union[str, bytes]) -> bytes:
+    """Build a raw RFC 822 message from headers and a plain text body.
+    
+    The message is written piece by piece into one buffer, so no intermediate
+    copy of the whole message is made. body_text may be given as bytes to
+    avoid encoding large synthetic bodies.
+    """
+    # Headers are nearly always ASCII, which encodes faster than UTF-8; fall
+    # back to UTF-8 for fixtures with non-ASCII header values
+    try:
+        header_lines = [k.encode("ascii") + b": " + v.encode("ascii") + b"\r\n" for k, v in headers.items()]
+    except UnicodeEncodeError:
+        header_lines = [f"{k}: {v}\r\n".encode("utf-8") for k, v in headers.items()]
+    
+    # Header lines, a blank separator line, then the body
+    buffer = io.BytesIO()
+    buffer.writelines(header_lines)
+    buffer.write(b"\r\n")
+    buffer.write(body_text if isinstance(body_text, bytes) else body_text.encode("utf-8"))
+    return buffer.getvalue()
+
+
+DEFAULT_RESPONSE_BODY = build_response_body(DEFAULT_RESPONSE_HEADERS, DEFAULT_RESPONSE_BODY_TEXT)
+
+# Default recipients for make_test_email_message; tuples so they can be shared
+DEFAULT_TO_ADDRS = (("recipient@example.com", "Test Recipient"),)
+
+# Sequence numbers for auto-generated Message-IDs; unique within a test session
+_message_id_counter = itertools.count(1)
+
+
 def pytest_addoption(parser):
     """Add command-line options to pytest."""
     parser.addoption(
@@ -45,6 +98,18 @@ def pytest_addoption(parser):
         default=False,
         help="Skip integration tests that require real services",
     )
+    parser.addoption(
+        "--deselect-integration",
+        action="store_true",
+        default=False,
+        help="Drop integration tests from the run entirely instead of skipping them",
+    )
+    parser.addoption(
+        "--force-reinstall",
+        action="store_true",
+        default=False,
+        help="Reinstall the mcp-cli dependencies with uv sync --reinstall",
+    )
 
 
 def pytest_configure(config):
@@ -55,56 +120,82 @@ def pytest_configure(config):
 
 
 def pytest_collection_modifyitems(config, items):
-    """Skip integration tests if --skip-integration is provided."""
-    if config.getoption("--skip-integration"):
-        skip_integration = pytest.mark.skip(reason="Integration tests skipped with --skip-integration")
+    """Skip or deselect integration tests if requested on the command line."""
+    if config.getoption("--deselect-integration"):
+        # Deselected tests never get set up, run or reported as skipped
+        selected = []
+        deselected = []
         for item in items:
-            if "integration" in item.keywords:
-                item.add_marker(skip_integration)
+            (deselected if "integration" in item.keywords else selected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        return
+    
+    if not config.getoption("--skip-integration"):
+        return
+    
+    skip_integration = pytest.mark.skip(reason="Integration tests skipped with --skip-integration")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
 
 
 @pytest.fixture
 def mock_imap_client():
-    """Create a mock IMAPClient for testing."""
-    with patch("imapclient.IMAPClient") as mock_client:
-        client_instance = MagicMock()
-        mock_client.return_value = client_instance
-        
+    """Create a mock IMAPClient for testing.
+    
+    A plain Mock is used rather than MagicMock: IMAPClient is never used via
+    magic methods, and Mock skips configuring them for every test. Tests rely
+    on the Mock call-recording API, so this is not replaced by a custom stub.
+    """
+    client_instance = Mock(**{
         # Set up standard responses
-        client_instance.list_folders.return_value = [
+        "list_folders.return_value": [
             ((b"\\HasNoChildren",), b"/", "INBOX"),
             ((b"\\HasNoChildren",), b"/", "Sent"),
             ((b"\\HasNoChildren",), b"/", "Drafts"),
             ((b"\\HasNoChildren",), b"/", "Trash"),
-        ]
-        client_instance.select_folder.return_value = {b"EXISTS": 5}
-        client_instance.search.return_value = [1, 2, 3, 4, 5]
-        
+        ],
+        "select_folder.return_value": {b"EXISTS": 5},
+        "search.return_value": [1, 2, 3, 4, 5],
+    })
+    
+    # The patched class only needs to hand out the instance, so a plain Mock
+    # is enough there as well
+    with patch("imapclient.IMAPClient", new_callable=Mock, return_value=client_instance):
         yield client_instance
 
 
-@pytest.fixture
+# The email fixtures below are only read by tests, so they are built once per
+# session instead of once per test. Tests must not modify them.
+@pytest.fixture(scope="session")
 def test_email_message_simple():
     """Create a simple test email message."""
+    from email.mime.text import MIMEText
+    
     msg = MIMEText("This is a simple test email.")
     msg["From"] = "Test Sender <sender@example.com>"
     msg["To"] = "Test Recipient <recipient@example.com>"
     msg["Subject"] = "Simple Test Email"
     msg["Message-ID"] = "<simple-test-123@example.com>"
-    msg["Date"] = email.utils.formatdate()
+    msg["Date"] = FIXED_DATE
     return msg
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_email_message_multipart():
     """Create a multipart test email message with text and HTML parts."""
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    
     msg = MIMEMultipart()
     msg["From"] = "Test Sender <sender@example.com>"
     msg["To"] = "Test Recipient <recipient@example.com>, cc-person@example.com"
     msg["Cc"] = "Another Person <another@example.com>"
     msg["Subject"] = "Multipart Test Email"
     msg["Message-ID"] = "<multipart-test-123@example.com>"
-    msg["Date"] = email.utils.formatdate()
+    msg["Date"] = FIXED_DATE
     
     # Add text part
     text_part = MIMEText("This is the plain text content.", "plain")
@@ -117,15 +208,19 @@ def test_email_message_multipart():
     return msg
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_email_message_with_attachment():
     """Create a test email message with an attachment."""
+    from email.mime.application import MIMEApplication
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    
     msg = MIMEMultipart()
     msg["From"] = "Test Sender <sender@example.com>"
     msg["To"] = "Test Recipient <recipient@example.com>"
     msg["Subject"] = "Email with Attachment"
     msg["Message-ID"] = "<attachment-test-123@example.com>"
-    msg["Date"] = email.utils.formatdate()
+    msg["Date"] = FIXED_DATE
     
     # Add text part
     text_part = MIMEText("This email has an attachment.", "plain")
@@ -139,15 +234,18 @@ def test_email_message_with_attachment():
     return msg
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_email_message_encoded_headers():
     """Create a test email message with encoded headers."""
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    
     msg = MIMEMultipart()
     msg["From"] = str(Header("Jöhn Döe", "utf-8")) + " <john@example.com>"
     msg["To"] = str(Header("Märíä Smith", "utf-8")) + " <maria@example.com>"
     msg["Subject"] = Header("Tést Émàil with Éncödëd Headers", "utf-8").encode()
     msg["Message-ID"] = "<encoded-test-123@example.com>"
-    msg["Date"] = email.utils.formatdate()
+    msg["Date"] = FIXED_DATE
     
     # Add text part
     text_part = MIMEText("This email has encoded headers.", "plain")
@@ -156,96 +254,196 @@ def test_email_message_encoded_headers():
     return msg
 
 
-@pytest.fixture
+# Raw RFC 822 counterparts of the message fixtures above, for tests that only
+# need the bytes of a message (e.g. as an IMAP BODY[] value). Building and
+# serializing an email.mime object tree is skipped entirely.
+@pytest.fixture(scope="session")
+def test_email_bytes_simple() -> bytes:
+    """Create the raw bytes of a simple test email message."""
+    return b"\r\n".join([
+        b"Content-Type: text/plain; charset=\"us-ascii\"",
+        b"MIME-Version: 1.0",
+        b"Content-Transfer-Encoding: 7bit",
+        b"From: Test Sender <sender@example.com>",
+        b"To: Test Recipient <recipient@example.com>",
+        b"Subject: Simple Test Email",
+        b"Message-ID: <simple-test-123@example.com>",
+        b"Date: " + FIXED_DATE.encode("ascii"),
+        b"",
+        b"This is a simple test email.",
+    ])
+
+
+@pytest.fixture(scope="session")
+def test_email_bytes_multipart() -> bytes:
+    """Create the raw bytes of a multipart test email with text and HTML parts."""
+    return b"\r\n".join([
+        b"Content-Type: multipart/mixed; boundary=\"test-boundary\"",
+        b"MIME-Version: 1.0",
+        b"From: Test Sender <sender@example.com>",
+        b"To: Test Recipient <recipient@example.com>, cc-person@example.com",
+        b"Cc: Another Person <another@example.com>",
+        b"Subject: Multipart Test Email",
+        b"Message-ID: <multipart-test-123@example.com>",
+        b"Date: " + FIXED_DATE.encode("ascii"),
+        b"",
+        b"--test-boundary",
+        b"Content-Type: text/plain; charset=\"us-ascii\"",
+        b"Content-Transfer-Encoding: 7bit",
+        b"",
+        b"This is the plain text content.",
+        b"--test-boundary",
+        b"Content-Type: text/html; charset=\"us-ascii\"",
+        b"Content-Transfer-Encoding: 7bit",
+        b"",
+        b"<p>This is the <b>HTML</b> content.</p>",
+        b"--test-boundary--",
+        b"",
+    ])
+
+
+@functools.lru_cache(maxsize=256)
+def _build_test_email_message(
+    from_addr: str,
+    from_name: str,
+    to_addrs: Tuple[Tuple[str, str], ...],
+    cc_addrs: Tuple[Tuple[str, str], ...],
+    bcc_addrs: Tuple[Tuple[str, str], ...],
+    subject: str,
+    body_text: str,
+    body_html: Optional[str],
+    attachments: Tuple[Tuple[str, bytes, str], ...],
+    date: Optional[datetime.datetime],
+    message_id: Optional[str],
+    headers: Tuple[Tuple[str, str], ...],
+):
+    """Build a test email message, cached on its (hashable) arguments.
+    
+    The cached message is a template; callers must copy it before handing it out.
+    """
+    from email.mime.application import MIMEApplication
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    
+    # Create multipart message
+    msg = MIMEMultipart() if body_html or attachments else MIMEText(body_text)
+    
+    # Add basic headers
+    msg["From"] = f"{from_name} <{from_addr}>" if from_name else from_addr
+    msg["To"] = ", ".join([f"{name} <{addr}>" if name else addr for addr, name in to_addrs])
+    
+    if cc_addrs:
+        msg["Cc"] = ", ".join([f"{name} <{addr}>" if name else addr for addr, name in cc_addrs])
+    if bcc_addrs:
+        msg["Bcc"] = ", ".join([f"{name} <{addr}>" if name else addr for addr, name in bcc_addrs])
+        
+    msg["Subject"] = subject
+    
+    # Add date
+    if date:
+        msg["Date"] = email.utils.format_datetime(date)
+    else:
+        msg["Date"] = FIXED_DATE
+        
+    # Add Message-ID
+    if message_id:
+        msg["Message-ID"] = message_id
+    else:
+        # Placeholder; make_test_email_message gives every copy its own ID
+        msg["Message-ID"] = f"<test-{next(_message_id_counter)}@example.com>"
+        
+    # Add additional headers
+    for name, value in headers:
+        msg[name] = value
+        
+    # If multipart, add parts
+    if isinstance(msg, MIMEMultipart):
+        # Add text part
+        text_part = MIMEText(body_text, "plain")
+        msg.attach(text_part)
+        
+        # Add HTML part if provided
+        if body_html:
+            html_part = MIMEText(body_html, "html")
+            msg.attach(html_part)
+            
+        # Add attachments
+        for filename, content, content_type in attachments:
+            attachment = MIMEApplication(content)
+            attachment.add_header("Content-Disposition", "attachment", filename=filename)
+            attachment.add_header("Content-Type", content_type)
+            msg.attach(attachment)
+            
+    return msg
+
+
+@pytest.fixture(scope="session")
 def make_test_email_message():
-    """Factory fixture to create customized test email messages."""
+    """Factory fixture to create customized test email messages.
+    
+    Messages are built once per set of arguments and every call returns a copy,
+    so tests may modify the result freely. Each copy without an explicit
+    message_id gets its own Message-ID.
+    """
     def _make_test_email_message(
         from_addr: str = "sender@example.com",
         from_name: str = "Test Sender",
-        to_addrs: List[Tuple[str, str]] = [("recipient@example.com", "Test Recipient")],
-        cc_addrs: List[Tuple[str, str]] = [],
-        bcc_addrs: List[Tuple[str, str]] = [],
+        to_addrs: Optional[List[Tuple[str, str]]] = None,
+        cc_addrs: Optional[List[Tuple[str, str]]] = None,
+        bcc_addrs: Optional[List[Tuple[str, str]]] = None,
         subject: str = "Test Email",
         body_text: str = "This is a test email.",
         body_html: Optional[str] = None,
-        attachments: List[Tuple[str, bytes, str]] = [],  # [(filename, content, content_type)]
+        attachments: Optional[List[Tuple[str, bytes, str]]] = None,  # [(filename, content, content_type)]
         date: Optional[datetime.datetime] = None,
         message_id: Optional[str] = None,
-        headers: Dict[str, str] = {},
-    ) -> MIMEMultipart:
+        headers: Optional[Dict[str, str]] = None,
+    ):
         """Create a customized email message for testing.
         
         Args:
             from_addr: Sender email address
             from_name: Sender name
             to_addrs: List of (email, name) tuples for To: recipients
+                (default: a single "Test Recipient")
             cc_addrs: List of (email, name) tuples for Cc: recipients
             bcc_addrs: List of (email, name) tuples for Bcc: recipients
             subject: Email subject
             body_text: Plain text body content
             body_html: HTML body content (optional)
             attachments: List of (filename, content, content_type) tuples
-            date: Email date (defaults to current time)
+            date: Email date (defaults to FIXED_DATE)
             message_id: Custom Message-ID (default: auto-generated)
             headers: Additional headers as dict
             
         Returns:
             Email message object
         """
-        # Create multipart message
-        msg = MIMEMultipart() if body_html or attachments else MIMEText(body_text)
-        
-        # Add basic headers
-        msg["From"] = f"{from_name} <{from_addr}>" if from_name else from_addr
-        msg["To"] = ", ".join(f"{name} <{addr}>" if name else addr for addr, name in to_addrs)
-        
-        if cc_addrs:
-            msg["Cc"] = ", ".join(f"{name} <{addr}>" if name else addr for addr, name in cc_addrs)
-        if bcc_addrs:
-            msg["Bcc"] = ", ".join(f"{name} <{addr}>" if name else addr for addr, name in bcc_addrs)
-            
-        msg["Subject"] = subject
-        
-        # Add date
-        if date:
-            msg["Date"] = email.utils.format_datetime(date)
-        else:
-            msg["Date"] = email.utils.formatdate()
-            
-        # Add Message-ID
-        if message_id:
-            msg["Message-ID"] = message_id
-        else:
-            msg["Message-ID"] = f"<test-{hash(subject)}-{hash(from_addr)}@example.com>"
-            
-        # Add additional headers
-        for name, value in headers.items():
-            msg[name] = value
-            
-        # If multipart, add parts
-        if isinstance(msg, MIMEMultipart):
-            # Add text part
-            text_part = MIMEText(body_text, "plain")
-            msg.attach(text_part)
-            
-            # Add HTML part if provided
-            if body_html:
-                html_part = MIMEText(body_html, "html")
-                msg.attach(html_part)
-                
-            # Add attachments
-            for filename, content, content_type in attachments:
-                attachment = MIMEApplication(content)
-                attachment.add_header("Content-Disposition", "attachment", filename=filename)
-                attachment.add_header("Content-Type", content_type)
-                msg.attach(attachment)
-                
+        # Normalize to hashable arguments for the cached builder; omitted
+        # arguments use shared immutable defaults without any conversion
+        template = _build_test_email_message(
+            from_addr,
+            from_name,
+            DEFAULT_TO_ADDRS if to_addrs is None else tuple(map(tuple, to_addrs)),
+            () if cc_addrs is None else tuple(map(tuple, cc_addrs)),
+            () if bcc_addrs is None else tuple(map(tuple, bcc_addrs)),
+            subject,
+            body_text,
+            body_html,
+            () if attachments is None else tuple(map(tuple, attachments)),
+            date,
+            message_id,
+            () if headers is None else tuple(headers.items()),
+        )
+        msg = copy.deepcopy(template)
+        if not message_id:
+            msg.replace_header("Message-ID", f"<test-{next(_message_id_counter)}@example.com>")
         return msg
     
     return _make_test_email_message
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_email_response_data():
     """Create test IMAP email response data."""
     return {
@@ -263,7 +461,7 @@ This is a test email body.
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def make_test_email_response_data():
     """Factory fixture to create customized IMAP email response data."""
     def _make_response_data(
@@ -271,21 +469,18 @@ def make_test_email_response_data():
         flags: Tuple[bytes, ...] = (b"\\Seen",),
         internal_date: str = "01-Jan-2023 12:00:00 +0000",
         body: Optional[bytes] = None,
-        headers: Dict[str, str] = {
-            "From": "Test Sender <sender@example.com>",
-            "To": "Test Recipient <recipient@example.com>",
-            "Subject": "Test Email",
-            "Date": "Thu, 01 Jan 2023 12:00:00 +0000",
-            "Message-ID": "<test-123@example.com>"
-        },
-        body_text: str = "This is a test email body."
+        headers: Optional[Dict[str, str]] = None,
+        body_text: Union[str, bytes] = DEFAULT_RESPONSE_BODY_TEXT
     ) -> Dict[bytes, Any]:
         """Create customized IMAP response data for testing."""
         if body is None:
-            # Construct body from headers and body_text
-            header_lines = [f"{k}: {v}" for k, v in headers.items()]
-            header_text = "\r\n".join(header_lines)
-            body = f"{header_text}\r\n\r\n{body_text}".encode("utf-8")
+            if headers is None and body_text == DEFAULT_RESPONSE_BODY_TEXT:
+                # Default message: reuse the bytes built at import time
+                body = DEFAULT_RESPONSE_BODY
+            else:
+                body = build_response_body(
+                    DEFAULT_RESPONSE_HEADERS if headers is None else headers, body_text
+                )
 
         return {
             b"BODY[]": body,
@@ -297,7 +492,7 @@ def make_test_email_response_data():
     return _make_response_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_email_model():
     """Create a test Email model instance."""
     return Email(
@@ -313,33 +508,75 @@ def test_email_model():
 
 
 @pytest.fixture
-def configure_test_env():
-    """Configure environment variables for testing."""
-    # Save original environment
-    original_env = os.environ.copy()
+def configure_test_env(monkeypatch):
+    """Configure environment variables for testing.
     
-    # Set test environment variables
-    os.environ["IMAP_SERVER"] = "imap.example.com"
-    os.environ["IMAP_PORT"] = "993"
-    os.environ["IMAP_USERNAME"] = "test@example.com"
-    os.environ["IMAP_PASSWORD"] = "test_password"
-    os.environ["MCP_SERVER_PORT"] = "3000"
+    monkeypatch restores only the variables set here on teardown.
+    """
+    monkeypatch.setenv("IMAP_SERVER", "imap.example.com")
+    monkeypatch.setenv("IMAP_PORT", "993")
+    monkeypatch.setenv("IMAP_USERNAME", "test@example.com")
+    monkeypatch.setenv("IMAP_PASSWORD", "test_password")
+    monkeypatch.setenv("MCP_SERVER_PORT", "3000")
+
+
+@pytest.fixture(scope="session")
+def sample_config_file(tmp_path_factory) -> str:
+    """Create a config file with test IMAP settings, shared by the session.
     
-    yield
+    Tests only read the file, so it is written once; tests that need to
+    modify it must copy it first.
+    """
+    config_data = {
+        "imap": {
+            "server": "imap.gmail.com",
+            "port": 993,
+            "username": "test@gmail.com"
+        }
+    }
     
-    # Restore original environment
-    os.environ.clear()
-    os.environ.update(original_env)
+    config_path = tmp_path_factory.mktemp("config") / "config.yaml"
+    config_path.write_text(yaml.dump(config_data, Dumper=YamlSafeDumper))
+    return str(config_path)
+
 
+@pytest.fixture(scope="session")
+def sample_credentials_file(tmp_path_factory) -> str:
+    """Create an OAuth2 client credentials file, shared by the session.
+    
+    Tests only read the file, so it is written once; tests that need to
+    modify it must copy it first.
+    """
+    credentials_data = {
+        "installed": {
+            "client_id": "test_client_id.apps.googleusercontent.com",
+            "client_secret": "test_client_secret",
+            "redirect_uris": ["http://localhost", "urn:ietf:wg:oauth:2.0:oob"],
+            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+    }
+    
+    credentials_path = tmp_path_factory.mktemp("credentials") / "credentials.json"
+    credentials_path.write_text(json.dumps(credentials_data))
+    return str(credentials_path)
 
-# Load environment variables from .env.test if it exists
-load_dotenv(".env.test")
 
 # Constants for Gmail integration tests
 TEST_EMAIL = os.getenv("GMAIL_TEST_EMAIL", "test@example.com")
 REQUIRED_ENV_VARS = ["GMAIL_CLIENT_ID", "GMAIL_CLIENT_SECRET", "GMAIL_REFRESH_TOKEN", "GMAIL_TEST_EMAIL"]
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _load_test_env() -> None:
+    """Load environment variables from .env.test if it exists.
+    
+    Done once per test session rather than at import, so test collection
+    alone does not read the file.
+    """
+    load_dotenv(".env.test")
+
+
 @contextmanager
 def timed_operation(description: str) -> Generator[None, None, None]:
     """Context manager to measure and log operation time.
@@ -356,22 +593,27 @@ def timed_operation(description: str) -> Generator[None, None, None]:
         logger.info(f"Completed: {description} in {elapsed:.2f} seconds")
 
 
+@functools.lru_cache(maxsize=1)
 def load_oauth2_credentials() -> Dict[str, str]:
     """Load OAuth2 credentials from environment variables.
     
+    The result is computed once per session; callers must not modify it.
+    
     Returns:
         Dictionary with OAuth2 credentials or empty dict if not available
     """
-    missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+    # Read each variable once
+    env = {var: os.environ.get(var, "") for var in REQUIRED_ENV_VARS}
+    missing_vars = [var for var, value in env.items() if not value]
     
     if missing_vars:
         logger.warning(f"Missing required environment variables: {', '.join(missing_vars)}")
         return {}
     
     return {
-        "client_id": os.getenv("GMAIL_CLIENT_ID", ""),
-        "client_secret": os.getenv("GMAIL_CLIENT_SECRET", ""),
-        "refresh_token": os.getenv("GMAIL_REFRESH_TOKEN", "")
+        "client_id": env["GMAIL_CLIENT_ID"],
+        "client_secret": env["GMAIL_CLIENT_SECRET"],
+        "refresh_token": env["GMAIL_REFRESH_TOKEN"]
     }
 
 
@@ -402,7 +644,8 @@ def gmail_config(gmail_oauth_credentials: Dict[str, str]) -> ImapConfig:
     return ImapConfig(
         host="imap.gmail.com",
         port=993,
-        username=TEST_EMAIL,
+        # .env.test is loaded after import, so look the address up again
+        username=os.getenv("GMAIL_TEST_EMAIL", TEST_EMAIL),
         use_ssl=True,
         oauth2=oauth2_config
     )
@@ -426,4 +669,50 @@ def gmail_client(gmail_config: ImapConfig) -> ImapClient:
     
     # Cleanup after test
     logger.info("Disconnecting from Gmail")
-    client.disconnect()
\ No newline at end of file
+    client.disconnect()
+
+
+@pytest.fixture(scope="session")
+def setup_mcp_cli(request) -> None:
+    """Ensure MCP CLI dependencies are installed, once per test session.
+    
+    uv sync only runs when uv.lock changed since the last successful sync,
+    whose hash is kept in pytest's cache rather than in the checkout, or when
+    the mcp-cli virtualenv is missing. Pass --force-reinstall to always run
+    uv sync --reinstall. Tests are skipped if there is no mcp-cli checkout.
+    """
+    lock_file = MCP_CLI_DIR / "uv.lock"
+    if not lock_file.exists():
+        pytest.skip(f"mcp-cli checkout not found at {MCP_CLI_DIR}")
+    
+    force_reinstall = request.config.getoption("--force-reinstall")
+    # The cache is unavailable when pytest runs with -p no:cacheprovider
+    cache = getattr(request.config, "cache", None)
+    lock_hash = hashlib.sha256(lock_file.read_bytes()).hexdigest()
+    if (
+        not force_reinstall
+        and (MCP_CLI_DIR / ".venv").exists()
+        and cache is not None
+        and cache.get(UV_SYNC_HASH_KEY, None) == lock_hash
+    ):
+        logger.info("MCP CLI dependencies are up to date")
+        return
+    
+    command = ["uv", "sync", "--reinstall"] if force_reinstall else ["uv", "sync"]
+    try:
+        # Run uv in the mcp-cli directory without changing our own cwd,
+        # which a session-wide fixture would leak into every later test
+        logger.info("Installing/updating MCP CLI dependencies...")
+        subprocess.run(
+            command,
+            cwd=MCP_CLI_DIR,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to install MCP CLI dependencies: {e}")
+        pytest.skip("Failed to install MCP CLI dependencies")
+    
+    if cache is not None:
+        cache.set(UV_SYNC_HASH_KEY, lock_hash)
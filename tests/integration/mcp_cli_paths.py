@@ -0,0 +1,9 @@
+"""Paths and cache keys shared by the mcp-cli integration tests."""
+
+from pathlib import Path
+
+# mcp-cli checkout used by the mcp-cli integration tests, next to the tests
+# directory regardless of where pytest was started
+MCP_CLI_DIR = Path(__file__).resolve().parent.parent.parent / "mcp-cli"
+# pytest cache key for the hash of the uv.lock dependencies were last synced from
+UV_SYNC_HASH_KEY = "imap-mcp/uv-sync-hash"
@@ -26,17 +26,25 @@ from imap_mcp.models import Context
 from imap_mcp.tools import search_emails as search_emails_tool
 
 
+@pytest.fixture(scope="session")
+def loaded_config():
+    """Load the configuration once for the whole test session."""
+    # Load config from the default location
+    return Config.load_config()
+
+
 class TestDirectToolsIntegration:
     """Test direct usage of IMAP MCP tools without going through the server or CLI."""
     
     @pytest.fixture(scope="class")
-    async def imap_client(self):
-        """Create and yield an IMAP client connected to Gmail."""
-        # Load config from the default location
-        config = Config.load_config()
+    def imap_client(self, loaded_config):
+        """Create and yield an IMAP client connected to Gmail.
         
+        ImapClient is synchronous, so this is a plain (non-async) fixture;
+        pytest caches it per class and connects only once for all tests.
+        """
         # Create IMAP client
-        client = ImapClient(config.email)
+        client = ImapClient(loaded_config.email)
         
         # Connect to the server
         client.connect()
@@ -48,7 +56,7 @@ class TestDirectToolsIntegration:
             client.disconnect()
 
     @pytest.fixture(scope="class")
-    async def context(self, imap_client):
+    def context(self, imap_client):
         """Create a context object with the IMAP client for use with tools."""
         # Create a minimal context object compatible with the tools
         ctx = Context(client=imap_client)
@@ -84,7 +92,8 @@ class TestDirectToolsIntegration:
         # Parse the JSON result
         try:
             results_dict = json.loads(results)
-            logger.info(f"Search results: {json.dumps(results_dict, indent=2)}")
+            # Formatted lazily, only if the record is actually emitted
+            logger.info("Search results: %s", results_dict)
             
             # Verify the result structure
             assert isinstance(results_dict, list), "Expected list of results"
@@ -108,38 +117,35 @@ class TestDirectToolsIntegration:
             pytest.fail(f"Invalid JSON returned from search_emails tool: {e}")
     
     @pytest.mark.asyncio
-    async def test_search_with_different_criteria(self, imap_client, context):
+    @pytest.mark.parametrize("query,criteria,description", [
+        ("", "all", "all emails"),
+        ("", "today", "emails from today"),
+        ("test", "subject", "emails with 'test' in subject"),
+    ])
+    async def test_search_with_different_criteria(self, imap_client, context, query, criteria, description):
         """Test searching with different criteria using the search_emails tool."""
-        # Test cases with different search criteria
-        test_cases = [
-            ("", "all", "all emails"),
-            ("", "today", "emails from today"),
-            ("test", "subject", "emails with 'test' in subject"),
-        ]
+        logger.info(f"Testing search for {description}")
+        
+        results = await search_emails_tool(
+            query=query,
+            ctx=context,
+            folder="INBOX",
+            criteria=criteria,
+            limit=5
+        )
         
-        for query, criteria, description in test_cases:
-            logger.info(f"Testing search for {description}")
+        # Parse and validate results
+        try:
+            results_dict = json.loads(results)
+            logger.info(f"Found {len(results_dict)} {description}")
             
-            results = await search_emails_tool(
-                query=query,
-                ctx=context,
-                folder="INBOX",
-                criteria=criteria,
-                limit=5
-            )
+            # Basic validation
+            assert isinstance(results_dict, list), f"Expected list of results for {description}"
             
-            # Parse and validate results
-            try:
-                results_dict = json.loads(results)
-                logger.info(f"Found {len(results_dict)} {description}")
-                
-                # Basic validation
-                assert isinstance(results_dict, list), f"Expected list of results for {description}"
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse search results for {description}: {e}")
-                logger.error(f"Raw results: {results}")
-                pytest.fail(f"Invalid JSON returned from search_emails tool for {description}: {e}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse search results for {description}: {e}")
+            logger.error(f"Raw results: {results}")
+            pytest.fail(f"Invalid JSON returned from search_emails tool for {description}: {e}")
 
 if __name__ == "__main__":
     # Enable running the tests directly
@@ -4,12 +4,17 @@ This module contains tests that connect to a real Gmail account using OAuth2 aut
 These tests require proper configuration and environment variables to run.
 """
 
+import functools
 import logging
 import os
+import socket
+import socketserver
+import ssl
+import threading
 import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Generator
+from typing import Dict, FrozenSet, List, Optional, Generator, Tuple
 
 import pytest
 from dotenv import load_dotenv
@@ -17,6 +22,7 @@ from dotenv import load_dotenv
 from imap_mcp.config import ImapConfig, OAuth2Config
 from imap_mcp.imap_client import ImapClient
 from imap_mcp.models import Email
+from imap_mcp.oauth2 import get_access_token
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -26,26 +32,33 @@ logger = logging.getLogger(__name__)
 TEST_EMAIL = os.getenv("GMAIL_TEST_EMAIL", "test@example.com")
 REQUIRED_ENV_VARS = ["GMAIL_CLIENT_ID", "GMAIL_CLIENT_SECRET", "GMAIL_REFRESH_TOKEN", "GMAIL_TEST_EMAIL"]
 
-# Load environment variables from .env.test if it exists
-load_dotenv(".env.test")
+# Load environment variables from .env.test if it exists, unless they are
+# already set (e.g. inherited by pytest-xdist workers)
+if not os.getenv("GMAIL_CLIENT_ID"):
+    load_dotenv(".env.test")
 
 
+@functools.lru_cache(maxsize=1)
 def load_oauth2_credentials() -> Dict[str, str]:
     """Load OAuth2 credentials from environment variables.
     
+    The result is computed once per session; callers must not modify it.
+    
     Returns:
         Dictionary with OAuth2 credentials or empty dict if not available
     """
-    missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
+    # Read each variable once
+    env = {var: os.environ.get(var, "") for var in REQUIRED_ENV_VARS}
+    missing_vars = [var for var, value in env.items() if not value]
     
     if missing_vars:
         logger.warning(f"Missing required environment variables: {', '.join(missing_vars)}")
         return {}
     
     return {
-        "client_id": os.getenv("GMAIL_CLIENT_ID", ""),
-        "client_secret": os.getenv("GMAIL_CLIENT_SECRET", ""),
-        "refresh_token": os.getenv("GMAIL_REFRESH_TOKEN", "")
+        "client_id": env["GMAIL_CLIENT_ID"],
+        "client_secret": env["GMAIL_CLIENT_SECRET"],
+        "refresh_token": env["GMAIL_REFRESH_TOKEN"]
     }
 
 
@@ -83,17 +96,27 @@ def timed_operation(description: str) -> Generator[None, None, None]:
     Args:
         description: Description of the operation being timed
     """
-    start_time = time.time()
-    logger.info(f"Starting: {description}")
+    # Skip formatting the messages entirely when INFO logging is off
+    log_enabled = logger.isEnabledFor(logging.INFO)
+    if log_enabled:
+        logger.info(f"Starting: {description}")
+    start_time = time.perf_counter_ns()
     try:
         yield
     finally:
-        elapsed = time.time() - start_time
-        logger.info(f"Completed: {description} in {elapsed:.2f} seconds")
+        if log_enabled:
+            elapsed = (time.perf_counter_ns() - start_time) / 1e9
+            logger.info(f"Completed: {description} in {elapsed:.2f} seconds")
 
 
 # Fixtures
-@pytest.fixture
+# Credentials, config and the connected client only depend on environment
+# variables, so they are created once per session. Under pytest-xdist every
+# worker has its own session and therefore its own connection; tests that
+# switch folders or compare cached counts are pinned to one worker with
+# xdist_group (run with --dist loadgroup). _reset_gmail_state puts the
+# shared client back into a known state before each test.
+@pytest.fixture(scope="session")
 def gmail_oauth_credentials() -> Dict[str, str]:
     """Get Gmail OAuth2 credentials from environment variables.
     
@@ -112,7 +135,7 @@ def gmail_oauth_credentials() -> Dict[str, str]:
     return credentials
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gmail_config(gmail_oauth_credentials: Dict[str, str]) -> ImapConfig:
     """Create a configuration for Gmail IMAP.
     
@@ -125,34 +148,173 @@ def gmail_config(gmail_oauth_credentials: Dict[str, str]) -> ImapConfig:
     return load_gmail_config(gmail_oauth_credentials)
 
 
-@pytest.fixture
-def gmail_client(gmail_config: ImapConfig) -> ImapClient:
+@pytest.fixture(scope="session")
+def gmail_ssl_context() -> ssl.SSLContext:
+    """Create one SSL context shared by every Gmail connection in the session.
+    
+    Loading the CA certificates only once saves work on each connect.
+    
+    Returns:
+        Default client SSL context
+    """
+    return ssl.create_default_context()
+
+
+@pytest.fixture(scope="session")
+def oauth_access_token(gmail_config: ImapConfig) -> Tuple[str, int]:
+    """Exchange the refresh token for an access token once per session.
+    
+    get_access_token stores the token and its expiry on gmail_config.oauth2,
+    so every ImapClient created from the session-scoped config reuses it and
+    only refreshes it again when it is about to expire.
+    
+    Args:
+        gmail_config: ImapConfig for Gmail with OAuth2
+        
+    Returns:
+        Tuple of (access_token, expiry_timestamp)
+    """
+    with timed_operation("Refreshing OAuth2 access token"):
+        return get_access_token(gmail_config.oauth2)
+
+
+@pytest.fixture(scope="session")
+def gmail_client(
+    gmail_config: ImapConfig,
+    oauth_access_token: Tuple[str, int],
+    gmail_ssl_context: ssl.SSLContext,
+) -> ImapClient:
     """Create and connect a Gmail IMAP client using OAuth2 authentication.
     
+    The connection is shared by all tests in the session.
+    
     Args:
         gmail_config: ImapConfig for Gmail with OAuth2
+        oauth_access_token: Access token already stored on gmail_config
+        gmail_ssl_context: Shared SSL context
         
     Returns:
         Connected ImapClient instance
     """
-    client = ImapClient(gmail_config)
+    client = ImapClient(gmail_config, ssl_context=gmail_ssl_context)
     with timed_operation("Connecting to Gmail"):
         client.connect()
     
     yield client
     
-    # Cleanup after test
+    # Cleanup after the session
     logger.info("Disconnecting from Gmail")
     client.disconnect()
 
 
+@pytest.fixture(scope="session")
+def gmail_folders(gmail_client: ImapClient) -> List[str]:
+    """List the Gmail folders once per session.
+    
+    Tests must not modify the returned list.
+    
+    Args:
+        gmail_client: Connected Gmail ImapClient
+        
+    Returns:
+        List of folder names
+    """
+    return gmail_client.list_folders()
+
+
+@pytest.fixture(scope="session")
+def gmail_folder_set(gmail_folders: List[str]) -> FrozenSet[str]:
+    """Gmail folder names as a set, for tests that only check membership.
+    
+    Args:
+        gmail_folders: List of Gmail folder names
+        
+    Returns:
+        Frozen set of folder names
+    """
+    return frozenset(gmail_folders)
+
+
+@pytest.fixture(scope="session")
+def inbox_message_count(gmail_client: ImapClient) -> int:
+    """Get the number of messages in INBOX once per session.
+    
+    Taken from the EXISTS count that SELECT already returns, so no SEARCH
+    is needed just to find out whether INBOX is empty.
+    
+    Args:
+        gmail_client: Connected Gmail ImapClient
+        
+    Returns:
+        Number of messages in INBOX
+    """
+    return gmail_client.select_folder("INBOX").get(b"EXISTS", 0)
+
+
+class _RejectHandler(socketserver.BaseRequestHandler):
+    """Close every connection as soon as it is accepted."""
+    
+    def handle(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="session")
+def fake_imap_reject() -> Generator[Tuple[str, int], None, None]:
+    """Run a local TCP server that drops every connection immediately.
+    
+    Yields:
+        (host, port) of the server
+    """
+    with socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RejectHandler) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server.server_address
+        server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def fake_imap_silent() -> Generator[Tuple[str, int], None, None]:
+    """Open a local listening socket that never answers.
+    
+    Connections complete the TCP handshake but never receive any data, so
+    clients run into their own timeout.
+    
+    Yields:
+        (host, port) of the socket
+    """
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        yield server.getsockname()[:2]
+
+
+@pytest.fixture(autouse=True)
+def _reset_gmail_state(request: pytest.FixtureRequest) -> None:
+    """Reset the shared Gmail client before each test that uses it.
+    
+    Tests that do not request gmail_client are left alone, so they neither
+    connect to Gmail nor get skipped for missing credentials.
+    """
+    if "gmail_client" not in request.fixturenames:
+        return
+    
+    client = request.getfixturevalue("gmail_client")
+    # Reconnect if an earlier test dropped the connection
+    client.ensure_connected()
+    client.folder_cache.clear()
+    client.count_cache.clear()
+    client.select_folder("INBOX")
+
+
 # Connection Tests
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_connect_oauth2(gmail_config: ImapConfig):
+def test_gmail_connect_oauth2(
+    gmail_config: ImapConfig,
+    oauth_access_token: Tuple[str, int],
+    gmail_ssl_context: ssl.SSLContext,
+):
     """Test basic connection to Gmail using OAuth2 authentication."""
-    client = ImapClient(gmail_config)
+    client = ImapClient(gmail_config, ssl_context=gmail_ssl_context)
     
     with timed_operation("OAuth2 connection"):
         client.connect()
@@ -176,9 +338,13 @@ def test_gmail_connect_oauth2(gmail_config: ImapConfig):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_reconnect(gmail_config: ImapConfig):
+def test_gmail_reconnect(
+    gmail_config: ImapConfig,
+    oauth_access_token: Tuple[str, int],
+    gmail_ssl_context: ssl.SSLContext,
+):
     """Test disconnection and reconnection capabilities."""
-    client = ImapClient(gmail_config)
+    client = ImapClient(gmail_config, ssl_context=gmail_ssl_context)
     
     # First connection
     with timed_operation("Initial connection"):
@@ -207,12 +373,13 @@ def test_gmail_reconnect(gmail_config: ImapConfig):
 
 @pytest.mark.integration
 @pytest.mark.gmail
-def test_gmail_connection_error_handling():
+def test_gmail_connection_error_handling(fake_imap_reject: Tuple[str, int]):
     """Test handling of connection errors with invalid configuration."""
-    # Use invalid credentials
+    # Point at a local server that drops the connection, instead of Gmail
+    host, port = fake_imap_reject
     invalid_config = ImapConfig(
-        host="imap.gmail.com",
-        port=993,
+        host=host,
+        port=port,
         username="invalid@gmail.com",
         password="invalid_password",
         use_ssl=True
@@ -233,12 +400,13 @@ def test_gmail_connection_error_handling():
 
 @pytest.mark.integration
 @pytest.mark.gmail
-def test_gmail_connection_timeout():
+def test_gmail_connection_timeout(fake_imap_silent: Tuple[str, int]):
     """Test connection timeout handling."""
-    # Use a non-routable IP to force timeout
+    # Use a local socket that never answers to force a timeout
+    host, port = fake_imap_silent
     invalid_config = ImapConfig(
-        host="10.255.255.1",  # Non-routable IP that should cause timeout
-        port=993,
+        host=host,
+        port=port,
         username=TEST_EMAIL,
         password="invalid",
         use_ssl=True
@@ -247,35 +415,35 @@ def test_gmail_connection_timeout():
     client = ImapClient(invalid_config)
     
     # Should raise an exception on connection attempt
-    with pytest.raises(Exception) as excinfo:
+    with pytest.raises(ConnectionError) as excinfo:
         with timed_operation("Timeout connection attempt"):
             # Pass timeout directly to the connect method
             client.connect(timeout=1)  # Very short timeout to speed up test
     
-    # Verify proper error handling
-    error_message = str(excinfo.value)
-    logger.info(f"Expected error: {error_message}")
-    assert "timeout" in error_message.lower() or "timed out" in error_message.lower()
+    # Verify the failure was the socket timing out waiting for the server
+    logger.info(f"Expected error: {excinfo.value}")
+    assert isinstance(excinfo.value.__cause__, TimeoutError), \
+        f"Expected a socket timeout, got {excinfo.value.__cause__!r}"
 
 
 # Folder Tests
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_list_folders(gmail_client: ImapClient):
+def test_gmail_list_folders(gmail_client: ImapClient, gmail_folders: List[str]):
     """Test listing folders in Gmail account."""
-    folders = gmail_client.list_folders()
-    
     # Check that we have a list of folders
-    assert isinstance(folders, list), "list_folders should return a list"
-    assert len(folders) > 0, "Gmail account should have at least one folder"
+    assert isinstance(gmail_folders, list), "list_folders should return a list"
+    assert len(gmail_folders) > 0, "Gmail account should have at least one folder"
     
     # Verify common Gmail folders exist
     common_folders = ["INBOX", "[Gmail]", "[Gmail]/All Mail", "[Gmail]/Sent Mail", "[Gmail]/Trash"]
-    found_folders = [f for f in folders]
     
     for folder in common_folders:
-        assert folder in found_folders, f"Common Gmail folder '{folder}' not found"
+        assert folder in gmail_folders, f"Common Gmail folder '{folder}' not found"
+    
+    # List again to exercise the client itself; this also fills the cache
+    folders = gmail_client.list_folders()
     
     # Test folder cache
     cached_folders = gmail_client.list_folders(refresh=False)
@@ -290,10 +458,10 @@ def test_gmail_list_folders(gmail_client: ImapClient):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_folder_selection(gmail_client: ImapClient):
+@pytest.mark.xdist_group("gmail")
+def test_gmail_folder_selection(gmail_client: ImapClient, gmail_folder_set: FrozenSet[str]):
     """Test selecting different folders."""
-    # Get available folders
-    folders = gmail_client.list_folders()
+    folders = gmail_folder_set
     assert len(folders) > 0, "No folders available for testing"
     
     # Test INBOX selection
@@ -324,10 +492,10 @@ def test_gmail_folder_selection(gmail_client: ImapClient):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_folder_permissions(gmail_client: ImapClient):
+@pytest.mark.xdist_group("gmail")
+def test_gmail_folder_permissions(gmail_client: ImapClient, gmail_folder_set: FrozenSet[str]):
     """Test folder permissions and boundary checks."""
-    # Get available folders
-    folders = gmail_client.list_folders()
+    folders = gmail_folder_set
     
     # Select an important folder like Sent Mail that should have restricted permissions
     if "[Gmail]/Sent Mail" in folders:
@@ -360,10 +528,27 @@ def test_gmail_folder_permissions(gmail_client: ImapClient):
 
 
 # Search Tests
+def _imap_date(days_ago: int) -> str:
+    """Format the date a number of days back as an IMAP search date."""
+    return (datetime.now() - timedelta(days=days_ago)).strftime("%d-%b-%Y")
+
+
+# Each criterion is its own test case, so failures are reported per criterion
+# and pytest-xdist can spread the searches across workers
+SEARCH_CRITERIA = ["ALL", "UNSEEN", "SEEN", "FROM gmail", "SUBJECT test", "SEEN FROM gmail"]
+
+DATE_SEARCH_CRITERIA = [
+    pytest.param(f"SINCE {_imap_date(30)}", id="last-30-days"),
+    pytest.param(f"SINCE {_imap_date(90)} BEFORE {_imap_date(30)}", id="90-to-30-days-ago"),
+    pytest.param(f"ON {_imap_date(0)}", id="today"),
+    pytest.param(f"SINCE {_imap_date(7)} UNSEEN", id="unread-last-week"),
+]
+
+
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_basic_search(gmail_client: ImapClient):
+def test_gmail_basic_search(gmail_client: ImapClient, gmail_folder_set: FrozenSet[str]):
     """Test basic search capabilities."""
     # First, select the INBOX
     gmail_client.select_folder("INBOX")
@@ -375,32 +560,8 @@ def test_gmail_basic_search(gmail_client: ImapClient):
     assert isinstance(all_messages, list), "Search should return a list of message IDs"
     logger.info(f"Found {len(all_messages)} messages in INBOX")
     
-    # Test different search criteria
-    search_criteria = [
-        "ALL",
-        "UNSEEN",
-        "SEEN",
-        "FROM gmail",
-        "SUBJECT test"
-    ]
-    
-    for criteria in search_criteria:
-        with timed_operation(f"Searching with criteria: {criteria}"):
-            results = gmail_client.search(criteria)
-        
-        assert isinstance(results, list), f"Search with criteria '{criteria}' should return a list"
-        logger.info(f"Found {len(results)} messages matching '{criteria}'")
-    
-    # Test combined criteria
-    combined_criteria = "SEEN FROM gmail"
-    with timed_operation(f"Searching with combined criteria: {combined_criteria}"):
-        combined_results = gmail_client.search(combined_criteria)
-    
-    assert isinstance(combined_results, list), "Combined search should return a list"
-    logger.info(f"Found {len(combined_results)} messages matching combined criteria")
-    
     # Try searching in another folder
-    if "[Gmail]/Sent Mail" in gmail_client.list_folders():
+    if "[Gmail]/Sent Mail" in gmail_folder_set:
         gmail_client.select_folder("[Gmail]/Sent Mail")
         sent_messages = gmail_client.search("ALL")
         assert isinstance(sent_messages, list), "Search in Sent Mail should return a list"
@@ -410,63 +571,41 @@ def test_gmail_basic_search(gmail_client: ImapClient):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_date_search(gmail_client: ImapClient):
-    """Test date-based search capabilities."""
-    # First, select the INBOX
-    gmail_client.select_folder("INBOX")
-    
-    # Get all messages as baseline
-    all_messages = gmail_client.search("ALL")
-    logger.info(f"Found {len(all_messages)} total messages in INBOX")
-    
-    # Search for messages from the last 30 days
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%d-%b-%Y")
-    date_criteria = f"SINCE {thirty_days_ago}"
-    
-    with timed_operation(f"Searching messages {date_criteria}"):
-        recent_messages = gmail_client.search(date_criteria)
-    
-    assert isinstance(recent_messages, list), "Date search should return a list"
-    logger.info(f"Found {len(recent_messages)} messages from the last 30 days")
-    
-    # Search for older messages
-    ninety_days_ago = (datetime.now() - timedelta(days=90)).strftime("%d-%b-%Y")
-    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%d-%b-%Y")
-    range_criteria = f"SINCE {ninety_days_ago} BEFORE {thirty_days_ago}"
-    
-    with timed_operation(f"Searching messages in date range"):
-        range_messages = gmail_client.search(range_criteria)
-    
-    assert isinstance(range_messages, list), "Date range search should return a list"
-    logger.info(f"Found {len(range_messages)} messages between 90 and 30 days ago")
-    
-    # Search for messages from today
-    today = datetime.now().strftime("%d-%b-%Y")
-    today_criteria = f"ON {today}"
-    
-    with timed_operation(f"Searching messages from today"):
-        today_messages = gmail_client.search(today_criteria)
+@pytest.mark.parametrize("criteria", SEARCH_CRITERIA)
+def test_gmail_search_criteria(gmail_client: ImapClient, criteria: str):
+    """Test searching INBOX with different criteria."""
+    with timed_operation(f"Searching with criteria: {criteria}"):
+        results = gmail_client.search(criteria)
     
-    assert isinstance(today_messages, list), "Today search should return a list"
-    logger.info(f"Found {len(today_messages)} messages from today")
-    
-    # Try more complex date-based queries
-    one_week_ago = (datetime.now() - timedelta(days=7)).strftime("%d-%b-%Y")
-    complex_criteria = f"SINCE {one_week_ago} UNSEEN"
+    assert isinstance(results, list), f"Search with criteria '{criteria}' should return a list"
+    logger.info(f"Found {len(results)} messages matching '{criteria}'")
+
+
+@pytest.mark.integration
+@pytest.mark.gmail
+@pytest.mark.oauth2
+@pytest.mark.parametrize("criteria", DATE_SEARCH_CRITERIA)
+def test_gmail_date_search(gmail_client: ImapClient, inbox_message_count: int, criteria: str):
+    """Test date-based search capabilities."""
+    if inbox_message_count == 0:
+        pytest.skip("No messages in INBOX for testing date search")
     
-    with timed_operation(f"Searching with complex criteria: {complex_criteria}"):
-        complex_results = gmail_client.search(complex_criteria)
+    with timed_operation(f"Searching messages {criteria}"):
+        results = gmail_client.search(criteria)
     
-    assert isinstance(complex_results, list), "Complex search should return a list"
-    logger.info(f"Found {len(complex_results)} unread messages from the last week")
+    assert isinstance(results, list), f"Date search '{criteria}' should return a list"
+    logger.info(f"Found {len(results)} of {inbox_message_count} INBOX messages matching '{criteria}'")
 
 
 # Content Tests
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_fetch_email(gmail_client: ImapClient):
+def test_gmail_fetch_email(gmail_client: ImapClient, inbox_message_count: int):
     """Test fetching email content."""
+    if inbox_message_count == 0:
+        pytest.skip("No messages available for testing email fetching")
+    
     # First, select the INBOX
     gmail_client.select_folder("INBOX")
     
@@ -504,7 +643,7 @@ def test_gmail_fetch_email(gmail_client: ImapClient):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_fetch_multiple_emails(gmail_client: ImapClient):
+def test_gmail_fetch_multiple_emails(gmail_client: ImapClient, monkeypatch: pytest.MonkeyPatch):
     """Test fetching multiple emails."""
     # First, select the INBOX
     gmail_client.select_folder("INBOX")
@@ -518,10 +657,23 @@ def test_gmail_fetch_multiple_emails(gmail_client: ImapClient):
     # Take at most 5 messages to avoid long test times
     message_ids = messages[-5:] if len(messages) > 5 else messages
     
+    # Count FETCH commands sent to the server
+    fetch_calls = []
+    original_fetch = gmail_client.client.fetch
+    
+    def counting_fetch(*args, **kwargs):
+        fetch_calls.append(args)
+        return original_fetch(*args, **kwargs)
+    
+    monkeypatch.setattr(gmail_client.client, "fetch", counting_fetch)
+    
     # Fetch multiple messages
     with timed_operation(f"Fetching {len(message_ids)} messages"):
         emails = gmail_client.fetch_emails(message_ids)
     
+    # All messages should come back from a single FETCH round trip
+    assert len(fetch_calls) == 1, f"Expected one FETCH command, got {len(fetch_calls)}"
+    
     # Verify we got the expected number of emails
     assert isinstance(emails, dict), "Fetched emails should be returned as a dictionary"
     assert len(emails) == len(message_ids), f"Expected {len(message_ids)} emails, got {len(emails)}"
@@ -593,28 +745,36 @@ def test_gmail_invalid_search(gmail_client: ImapClient):
 
 
 # Message Count Tests
+def _folder_counts(client: ImapClient, folder: str) -> Tuple[int, int, int]:
+    """Get (total, unread, read) counts for a folder.
+    
+    Other folders are counted with a single STATUS via get_folder_counts.
+    RFC 3501 says STATUS should not be used on the selected mailbox, so the
+    selected folder is counted differently: the total comes from the SELECT
+    response that search() refreshes, and since SELECT's UNSEEN is the first
+    unseen message number rather than a count, unread messages are searched
+    for. That search is heavier than a STATUS; it is there for correctness,
+    not to save a round trip.
+    """
+    if folder != client.current_folder:
+        return client.get_folder_counts(folder, refresh=True)
+    
+    unread_count = len(client.search("UNSEEN", folder=folder))
+    total_count = client.last_select_response.get(b"EXISTS", 0)
+    return total_count, unread_count, max(0, total_count - unread_count)
+
+
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_message_counts(gmail_client: ImapClient):
+@pytest.mark.xdist_group("gmail")
+def test_gmail_message_counts(gmail_client: ImapClient, gmail_folders: List[str]):
     """Test getting message counts from Gmail folders."""
-    # Test counts in INBOX
+    # Test counts in INBOX, the selected folder
     with timed_operation("Getting INBOX message counts"):
-        # Get all counts from the same folder status to ensure consistency
-        gmail_client.select_folder("INBOX")
-        folder_status = gmail_client.get_folder_status("INBOX")
-        total = folder_status.get(b"MESSAGES", 0)
-        unread = folder_status.get(b"UNSEEN", 0)
-        read = max(0, total - unread)  # Calculate read from the same status data
-        
-        # Now get the values using the client methods but use the refresh parameter
-        # to ensure we're getting the latest values
-        total_count = gmail_client.get_total_count("INBOX", refresh=True)
-        unread_count = gmail_client.get_unread_count("INBOX", refresh=True)
-        read_count = gmail_client.get_read_count("INBOX", refresh=True)
+        total_count, unread_count, read_count = _folder_counts(gmail_client, "INBOX")
     
     logger.info(f"INBOX total: {total_count}, unread: {unread_count}, read: {read_count}")
-    logger.info(f"Status values - total: {total}, unread: {unread}, read: {read}")
     
     # Verify counts are consistent with themselves
     assert total_count >= 0, "Total count should be non-negative"
@@ -623,22 +783,11 @@ def test_gmail_message_counts(gmail_client: ImapClient):
     assert total_count == unread_count + read_count, f"Total ({total_count}) should equal unread ({unread_count}) + read ({read_count})"
     
     # Test getting counts in a non-INBOX folder (e.g. "[Gmail]/Sent Mail")
-    folders = gmail_client.list_folders()
-    sent_folder = next((f for f in folders if 'sent' in f.lower()), None)
+    sent_folder = next((f for f in gmail_folders if 'sent' in f.lower()), None)
     
     if sent_folder:
         with timed_operation(f"Getting counts from {sent_folder}"):
-            # Get a single folder status and use its values consistently
-            gmail_client.select_folder(sent_folder)
-            folder_status = gmail_client.get_folder_status(sent_folder)
-            total = folder_status.get(b"MESSAGES", 0)
-            unread = folder_status.get(b"UNSEEN", 0)
-            read = max(0, total - unread)  # Calculate read from the same status data
-            
-            # Get the values using the client methods with refresh=True to ensure consistency
-            total_count = gmail_client.get_total_count(sent_folder, refresh=True)
-            unread_count = gmail_client.get_unread_count(sent_folder, refresh=True)
-            read_count = gmail_client.get_read_count(sent_folder, refresh=True)
+            total_count, unread_count, read_count = _folder_counts(gmail_client, sent_folder)
         
         logger.info(f"{sent_folder} total: {total_count}, unread: {unread_count}, read: {read_count}")
         
@@ -652,23 +801,21 @@ def test_gmail_message_counts(gmail_client: ImapClient):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_message_count_caching(gmail_client: ImapClient):
+@pytest.mark.xdist_group("gmail")
+def test_gmail_message_count_caching(gmail_client: ImapClient, gmail_folders: List[str]):
     """Test message count caching behavior with real Gmail account."""
-    # Get initial counts with a consistent folder status
+    # STATUS must not be sent for the selected mailbox (INBOX after the reset),
+    # so exercise the STATUS-backed cache on the Sent folder
+    folder = next((f for f in gmail_folders if 'sent' in f.lower() and f != gmail_client.current_folder), None)
+    if folder is None:
+        pytest.skip("No unselected Sent folder to count messages in")
+    
+    # Each call returns all three counts from one STATUS command (or the cache)
     with timed_operation("Initial count retrieval"):
-        gmail_client.select_folder("INBOX")
-        folder_status = gmail_client.get_folder_status("INBOX")
-        total = folder_status.get(b"MESSAGES", 0)
-        unread = folder_status.get(b"UNSEEN", 0)
-        read = max(0, total - unread)  # Calculate read from the same status data
-        
-        # Force refresh to ensure we have fresh cache values
-        total_count = gmail_client.get_total_count("INBOX", refresh=True)
-        unread_count = gmail_client.get_unread_count("INBOX", refresh=True)
-        read_count = gmail_client.get_read_count("INBOX", refresh=True)
+        counts = gmail_client.get_folder_counts(folder, refresh=True)
     
-    logger.info(f"INBOX total: {total_count}, unread: {unread_count}, read: {read_count}")
-    logger.info(f"Status values - total: {total}, unread: {unread}, read: {read}")
+    total_count, unread_count, read_count = counts
+    logger.info(f"{folder} total: {total_count}, unread: {unread_count}, read: {read_count}")
     
     # Verify counts are consistent with themselves
     assert total_count >= 0, "Total count should be non-negative"
@@ -678,31 +825,22 @@ def test_gmail_message_count_caching(gmail_client: ImapClient):
     
     # Get counts again - should use cache
     with timed_operation("Cached count retrieval"):
-        cached_total_count = gmail_client.get_total_count("INBOX")
-        cached_unread_count = gmail_client.get_unread_count("INBOX")
-        cached_read_count = gmail_client.get_read_count("INBOX")
+        cached_counts = gmail_client.get_folder_counts(folder)
     
-    logger.info(f"Cached INBOX total: {cached_total_count}, unread: {cached_unread_count}, read: {cached_read_count}")
+    logger.info(f"Cached {folder} (total, unread, read): {cached_counts}")
     
     # Counts should be identical to the values we just retrieved
-    assert cached_total_count == total_count, "Cached total count should match initial count"
-    assert cached_unread_count == unread_count, "Cached unread count should match initial count"
-    assert cached_read_count == read_count, "Cached read count should match initial count"
+    assert cached_counts == counts, "Cached counts should match initial counts"
     
     # Force refresh and check again - might match or might be different if emails arrived
     with timed_operation("Forced refresh count retrieval"):
-        total_count = gmail_client.get_total_count("INBOX", refresh=True)
-        unread_count = gmail_client.get_unread_count("INBOX", refresh=True)
-        read_count = gmail_client.get_read_count("INBOX", refresh=True)
+        total_count, unread_count, read_count = gmail_client.get_folder_counts(folder, refresh=True)
     
-    logger.info(f"Refreshed INBOX total: {total_count}, unread: {unread_count}, read: {read_count}")
+    logger.info(f"Refreshed {folder} total: {total_count}, unread: {unread_count}, read: {read_count}")
     
     # Log any differences
-    if cached_total_count != total_count or cached_unread_count != unread_count or cached_read_count != read_count:
-        logger.info(f"Count changed during test: " 
-                   f"total {cached_total_count}->{total_count}, "
-                   f"unread {cached_unread_count}->{unread_count}, "
-                   f"read {cached_read_count}->{read_count}")
+    if cached_counts != (total_count, unread_count, read_count):
+        logger.info(f"Counts changed during test: {cached_counts} -> {(total_count, unread_count, read_count)}")
     
     # This should still be true regardless of counts
     assert total_count == unread_count + read_count, "Total should equal unread + read after refresh"
@@ -711,40 +849,40 @@ def test_gmail_message_count_caching(gmail_client: ImapClient):
 @pytest.mark.integration
 @pytest.mark.gmail
 @pytest.mark.oauth2
-def test_gmail_message_count_special_folders(gmail_client: ImapClient):
+@pytest.mark.xdist_group("gmail")
+def test_gmail_message_count_special_folders(gmail_client: ImapClient, gmail_folders: List[str]):
     """Test getting message counts from Gmail special folders."""
-    folders = gmail_client.list_folders()
-    
-    # Find Gmail special folders
-    special_folders = [f for f in folders if '[Gmail]/' in f or '[Google Mail]/' in f]
+    # Find Gmail special folders that can hold messages; list_folders caches
+    # each folder's flags, and \Noselect folders cannot be counted
+    special_folders = [
+        f for f in gmail_folders
+        if ('[Gmail]/' in f or '[Google Mail]/' in f)
+        and not any(flag.lower() == b"\\noselect" for flag in gmail_client.folder_cache.get(f, ()))
+    ]
     
     if not special_folders:
         pytest.skip("No Gmail special folders found, skipping test")
     
     # Test a few special folders
+    counted = 0
     for folder in special_folders[:3]:  # Limit to 3 folders to keep test duration reasonable
-        with timed_operation(f"Getting counts from {folder}"):
-            try:
-                # Get a single folder status and use its values consistently
-                gmail_client.select_folder(folder)
-                folder_status = gmail_client.get_folder_status(folder)
-                total = folder_status.get(b"MESSAGES", 0)
-                unread = folder_status.get(b"UNSEEN", 0)
-                read = max(0, total - unread)  # Calculate read from the same status data
-                
-                # Get the values using the client methods with refresh=True to ensure consistency
-                total_count = gmail_client.get_total_count(folder, refresh=True)
-                unread_count = gmail_client.get_unread_count(folder, refresh=True)
-                read_count = gmail_client.get_read_count(folder, refresh=True)
-                
-                logger.info(f"{folder} total: {total_count}, unread: {unread_count}, read: {read_count}")
-                
-                # Verify counts are consistent with themselves
-                assert total_count >= 0, f"Total count for {folder} should be non-negative"
-                assert unread_count >= 0, f"Unread count for {folder} should be non-negative"
-                assert read_count >= 0, f"Read count for {folder} should be non-negative"
-                assert total_count == unread_count + read_count, f"Total should equal unread + read for {folder}"
-            except Exception as e:
-                # Some special folders might have restrictions
-                logger.warning(f"Error getting counts from {folder}: {e}")
-                continue
+        try:
+            with timed_operation(f"Getting counts from {folder}"):
+                # All counts come from a single STATUS, without selecting the folder
+                total_count, unread_count, read_count = gmail_client.get_folder_counts(folder, refresh=True)
+        except ConnectionError as e:
+            # Some accounts restrict access to individual special folders
+            logger.warning(f"Could not get counts for {folder}: {e}")
+            continue
+        counted += 1
+        
+        logger.info(f"{folder} total: {total_count}, unread: {unread_count}, read: {read_count}")
+        
+        # Verify counts are consistent with themselves
+        assert total_count >= 0, f"Total count for {folder} should be non-negative"
+        assert unread_count >= 0, f"Unread count for {folder} should be non-negative"
+        assert read_count >= 0, f"Read count for {folder} should be non-negative"
+        assert total_count == unread_count + read_count, f"Total should equal unread + read for {folder}"
+    
+    if not counted:
+        pytest.skip("No Gmail special folder could be counted")
@@ -9,13 +9,15 @@ the --skip-integration flag.
 import json
 import os
 import pytest
+import signal
 import subprocess
 import time
 import logging
-import tempfile
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,66 +30,122 @@ pytestmark = pytest.mark.integration
 PROJECT_ROOT = Path.cwd()
 SERVER_SCRIPT = PROJECT_ROOT / "scripts" / "run_imap_mcp_server.sh"
 
+# Log line prefix for each tool the server registers in debug mode
+TOOL_MARKER = "Registered tool:"
+
+def make_log_checker(messages: Tuple[str, ...]) -> Callable[[str], None]:
+    """Create a check that asserts every one of messages appears in a log.
+    
+    All missing messages are reported together in a single assertion.
+    """
+    def _check(log_content: str) -> None:
+        missing = [message for message in messages if message not in log_content]
+        assert not missing, f"Expected log lines not found: {missing}"
+    
+    return _check
+
+
+# Help output listing the usage line and the main options
+check_help_output = make_log_checker(("usage:", "--config CONFIG", "--dev"))
+
+# Log lines of a successful Gmail OAuth2 connection and clean disconnection
+check_gmail_connection = make_log_checker((
+    "Connected to IMAP server imap.gmail.com",
+    "Using OAuth2 authentication",
+    "Refreshing Gmail access token",
+    "Disconnected from IMAP server",
+))
+
 def run_server_command(args=None):
-    """Run the IMAP MCP server with specified arguments and return the result."""
+    """Run the IMAP MCP server with specified arguments and return the result.
+    
+    The server's output is captured in memory rather than written to a log
+    file and read back, since the tests only search it for substrings.
+    
+    Args:
+        args: Sequence of arguments for the server script (default: --dev)
+    """
     if args is None:
         args = ["--dev"]
     
     server_cmd = str(SERVER_SCRIPT)
-    command = [server_cmd] + args
-    
-    # Create temporary file for server output
-    with tempfile.NamedTemporaryFile(prefix="imap_server_", suffix=".log", delete=False, mode='w') as temp:
-        log_path = temp.name
-        logger.info(f"Server output will be logged to: {log_path}")
+    command = [server_cmd] + list(args)
     
+    # Run the server process and wait for it to complete
+    logger.info(f"Running command: {' '.join(command)}")
+    # Start the server in its own session, so a timeout can kill the Python
+    # interpreter the wrapper script launches along with the script itself
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        # Merged into the stdout pipe, so lines stay in the order written
+        stderr=subprocess.STDOUT,
+        text=True,
+        start_new_session=True
+    )
     try:
-        # Run the server process and wait for it to complete
-        logger.info(f"Running command: {' '.join(command)}")
-        with open(log_path, 'w') as log_file:
-            result = subprocess.run(
-                command,
-                stdout=log_file,
-                stderr=log_file,
-                text=True,
-                timeout=30  # Set a reasonable timeout
-            )
-        
-        # Read the log file
-        with open(log_path, 'r') as f:
-            log_content = f.read()
-        
-        logger.info(f"Command completed with exit code {result.returncode}")
-        logger.info(f"Log output: {log_content}")
-        
-        return result.returncode, log_content
+        log_content, _ = process.communicate(timeout=30)  # Set a reasonable timeout
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.communicate()
+        raise
     
-    finally:
-        # Clean up the log file
-        if os.path.exists(log_path):
-            try:
-                os.unlink(log_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete log file {log_path}: {e}")
+    logger.info(f"Command completed with exit code {process.returncode}")
+    # Formatted lazily, so a large log is not copied into a message that is
+    # never emitted
+    logger.info("Log output: %s", log_content)
+    
+    return process.returncode, log_content
+
+@pytest.fixture(scope="session")
+def server_runs(request):
+    """Run the server once per distinct argument tuple for the whole session.
+    
+    The invocations are independent and mostly wait on interpreter start-up
+    and the network, so the runs declared with @pytest.mark.server_args by the
+    selected tests all start concurrently before the first test. Runs no
+    selected test declares never start, so e.g. -k help does not log in to
+    Gmail; a run that was not declared starts on its first lookup. Each test
+    waits for its own run only, so a run that fails or times out errors just
+    the tests that use it.
+    """
+    requested = {
+        marker.args
+        for item in request.session.items
+        for marker in item.iter_markers("server_args")
+    }
+    with ThreadPoolExecutor(max_workers=max(len(requested), 1)) as executor:
+        futures = {
+            args: executor.submit(run_server_command, args)
+            for args in requested
+        }
+        
+        def _result(args: Tuple[str, ...]) -> Tuple[int, str]:
+            if args not in futures:
+                futures[args] = executor.submit(run_server_command, args)
+            return futures[args].result()
+        
+        yield _result
+
 
 class TestImapMcpServerBasic:
     """Basic tests for the IMAP MCP server functionality."""
     
-    def test_server_help_command(self):
+    @pytest.mark.server_args("--help")
+    def test_server_help_command(self, server_runs):
         """Test that the server script responds to --help properly."""
-        returncode, log_content = run_server_command(["--help"])
+        returncode, log_content = server_runs(("--help",))
         
         # Check exit code
         assert returncode == 0, f"Server exited with non-zero code: {returncode}"
         
         # Check for help content in the output
-        assert "usage:" in log_content, "Help output not found"
-        assert "--config CONFIG" in log_content, "Config option not found in help"
-        assert "--dev" in log_content, "Dev option not found in help"
+        check_help_output(log_content)
     
-    def test_server_version_command(self):
+    @pytest.mark.server_args("--version")
+    def test_server_version_command(self, server_runs):
         """Test that the server script responds to --version properly."""
-        returncode, log_content = run_server_command(["--version"])
+        returncode, log_content = server_runs(("--version",))
         
         # Check exit code
         assert returncode == 0, f"Server exited with non-zero code: {returncode}"
@@ -95,26 +153,21 @@ class TestImapMcpServerBasic:
         # Check for version information
         assert "version" in log_content.lower(), "Version information not found"
     
-    def test_server_connects_to_gmail(self):
+    @pytest.mark.server_args("--dev")
+    def test_server_connects_to_gmail(self, server_runs):
         """Verify that the server can connect to Gmail."""
-        returncode, log_content = run_server_command(["--dev"])
+        returncode, log_content = server_runs(("--dev",))
         
         # Check exit code
         assert returncode == 0, f"Server exited with non-zero code: {returncode}"
         
-        # Check for successful connection
-        assert "Connected to IMAP server imap.gmail.com" in log_content, "Failed to connect to Gmail"
-        
-        # Check for successful OAuth2 authentication
-        assert "Using OAuth2 authentication" in log_content, "Not using OAuth2 authentication"
-        assert "Refreshing Gmail access token" in log_content, "Did not refresh Gmail token"
-        
-        # Verify clean disconnection
-        assert "Disconnected from IMAP server" in log_content, "Did not disconnect cleanly"
+        # Check connection, OAuth2 authentication and clean disconnection
+        check_gmail_connection(log_content)
     
-    def test_server_starts_in_dev_mode(self):
+    @pytest.mark.server_args("--dev")
+    def test_server_starts_in_dev_mode(self, server_runs):
         """Verify that the server starts in development mode."""
-        returncode, log_content = run_server_command(["--dev"])
+        returncode, log_content = server_runs(("--dev",))
         
         # Check exit code
         assert returncode == 0, f"Server exited with non-zero code: {returncode}"
@@ -122,9 +175,10 @@ class TestImapMcpServerBasic:
         # Verify development mode
         assert "Starting server in development mode" in log_content, "Server not in development mode"
     
-    def test_server_config_loading(self):
+    @pytest.mark.server_args("--dev")
+    def test_server_config_loading(self, server_runs):
         """Verify that the server loads its configuration correctly."""
-        returncode, log_content = run_server_command(["--dev"])
+        returncode, log_content = server_runs(("--dev",))
         
         # Check exit code
         assert returncode == 0, f"Server exited with non-zero code: {returncode}"
@@ -135,10 +189,15 @@ class TestImapMcpServerBasic:
     def find_available_tools(self, log_content):
         """Extract available tools from the server log."""
         tools = []
-        for line in log_content.splitlines():
-            if "Registered tool:" in line:
-                tool_name = line.split("Registered tool:")[1].strip()
-                tools.append(tool_name)
+        # Jump from marker to marker instead of splitting the whole log into lines
+        start = log_content.find(TOOL_MARKER)
+        while start != -1:
+            start += len(TOOL_MARKER)
+            end = log_content.find("\n", start)
+            if end == -1:
+                end = len(log_content)
+            tools.append(log_content[start:end].strip())
+            start = log_content.find(TOOL_MARKER, end)
         return tools
 
     @pytest.mark.skip("Skip until debug mode is properly configured")
@@ -200,13 +259,14 @@ if __name__ == "__main__":
         args = parser.parse_args()
         
         test = TestImapMcpServerBasic()
+        # A single test runs the server once, so no memoization is needed
         if args.test == "help":
-            test.test_server_help_command()
+            test.test_server_help_command(run_server_command)
         elif args.test == "version":
-            test.test_server_version_command()
+            test.test_server_version_command(run_server_command)
         elif args.test == "connect":
-            test.test_server_connects_to_gmail()
+            test.test_server_connects_to_gmail(run_server_command)
         elif args.test == "dev":
-            test.test_server_starts_in_dev_mode()
+            test.test_server_starts_in_dev_mode(run_server_command)
     else:
         print("Use pytest to run the tests")
@@ -10,10 +10,14 @@ import pytest
 import subprocess
 import time
 import logging
-import tempfile
 import re
+import queue
+import threading
+import uuid
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, TextIO, Tuple
+
+from tests.integration.mcp_cli_paths import MCP_CLI_DIR
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,29 +27,48 @@ logger = logging.getLogger(__name__)
 pytestmark = pytest.mark.integration
 
 # Define paths and variables
-PROJECT_ROOT = Path.cwd()
-MCP_CLI_DIR = PROJECT_ROOT / "mcp-cli"
 SERVER_CONFIG_FILE = MCP_CLI_DIR / "server_config.json"
 
+# Formats an email listing may be rendered in, compiled once for all tests
+_TABLE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r"(\+[-+]+\+)|(│.*│)",  # ASCII table patterns
+        r"(\|.*\|)",  # Simple pipe-based table
+        r"^(\s*\d+\.\s+.*subject.*from.*date)",  # Numbered list with headers
+        r"(no unread emails|inbox is empty)",  # No emails message
+    )
+)
+
+# Prompts that mark the end of a response and the wait for the next input
+_PROMPT_MARKERS = ("Human: ", "USER: ", "You: ", "> ", ">> ")
+# Output carried over between lines so a marker split across them is found
+_PROMPT_TAIL_LEN = max(len(marker) for marker in _PROMPT_MARKERS) - 1
+
 class ChatSession:
     """Helper class to manage an interactive chat session with mcp-cli."""
     
-    def __init__(self, server="imap", model="llama3.2", provider="ollama"):
-        """Initialize chat session with specified server and model."""
+    def __init__(self, server="imap", model="llama3.2", provider="ollama", log_dir: Optional[Path] = None):
+        """Initialize chat session with specified server and model.
+        
+        Output is logged to a file in log_dir; without one, nothing is logged.
+        """
         self.server = server
         self.model = model
         self.provider = provider
         self.process = None
-        self.log_path = None
+        self.log_path = log_dir / f"mcp_chat_{uuid.uuid4().hex}.log" if log_dir else None
         self.outputs = []
         self.timeout = 60  # Default timeout in seconds
+        # Lines read from the child's stdout/stderr by the pump threads
+        self._stdout_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pumps: List[threading.Thread] = []
+        # Append-mode handle on log_path, open from start() until stop()
+        self._log_file: Optional[TextIO] = None
     
     def start(self) -> bool:
         """Start the chat session."""
-        # Save current directory and change to mcp-cli directory
-        original_dir = os.getcwd()
-        os.chdir(MCP_CLI_DIR)
-        
         try:
             # Prepare command
             cmd = [
@@ -55,10 +78,9 @@ class ChatSession:
                 "--model", f"{self.model}:latest"
             ]
             
-            # Create log file
-            with tempfile.NamedTemporaryFile(prefix="mcp_chat_", suffix=".log", delete=False, mode='w') as temp:
-                self.log_path = temp.name
+            if self.log_path:
                 logger.info(f"Chat session output will be logged to: {self.log_path}")
+                self._log_file = open(self.log_path, 'a', buffering=65536)
             
             # Start process
             logger.info(f"Starting chat session: {' '.join(cmd)}")
@@ -68,32 +90,44 @@ class ChatSession:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
-                env=dict(os.environ, PYTHONPATH=str(MCP_CLI_DIR))
+                # Run from the mcp-cli checkout without changing the test
+                # process's working directory
+                cwd=str(MCP_CLI_DIR),
+                # Read the pipes in large chunks; the child flushes every
+                # write so prompts arrive without waiting for a full buffer
+                bufsize=16384,
+                env=dict(os.environ, PYTHONUNBUFFERED="1", PYTHONPATH=str(MCP_CLI_DIR))
             )
             
-            # Wait for initialization (look for welcome message)
-            start_time = time.time()
-            initialized = False
+            # Drain both pipes continuously, so a chatty stderr can never fill
+            # its pipe buffer and block the child while we wait on stdout
+            self._pumps = [
+                threading.Thread(target=self._pump, args=(stream, lines), daemon=True)
+                for stream, lines in (
+                    (self.process.stdout, self._stdout_lines),
+                    (self.process.stderr, self._stderr_lines),
+                )
+            ]
+            for pump in self._pumps:
+                pump.start()
             
-            while time.time() - start_time < 30:  # 30 seconds timeout for initialization
-                if self.process.poll() is not None:
-                    # Process exited
-                    logger.error(f"Chat process exited with code {self.process.returncode}")
-                    stderr = self.process.stderr.read() if self.process.stderr else ""
-                    logger.error(f"Error output: {stderr}")
+            # Wait for initialization (look for welcome message); this returns
+            # as soon as the banner line arrives or stdout closes
+            if not self._await_welcome(timeout=30):  # 30 seconds timeout for initialization
+                try:
+                    # A closed stdout means the process is exiting
+                    returncode = self.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    logger.error("Chat session initialization timed out")
+                    self.stop()
                     return False
                 
-                # Check if there's any output
-                output = self._read_output(timeout=0.5)
-                if output and ("Welcome" in output or "How can I help" in output):
-                    initialized = True
-                    break
-                
-                time.sleep(0.5)
-            
-            if not initialized:
-                logger.error("Chat session initialization timed out")
-                self.stop()
+                # Process exited
+                logger.error(f"Chat process exited with code {returncode}")
+                for pump in self._pumps:
+                    pump.join(timeout=1)
+                stderr = "".join(self._drain(self._stderr_lines))
+                logger.error(f"Error output: {stderr}")
                 return False
             
             logger.info("Chat session initialized successfully")
@@ -104,10 +138,6 @@ class ChatSession:
             if self.process and self.process.poll() is None:
                 self.process.terminate()
             return False
-            
-        finally:
-            # Return to original directory
-            os.chdir(original_dir)
     
     def send_command(self, command: str, timeout: Optional[int] = None) -> str:
         """Send a command to the chat session and return the response."""
@@ -126,6 +156,8 @@ class ChatSession:
             # Read response
             response = self._read_output(timeout=timeout)
             logger.info(f"Received response: {response[:500]}...")  # Truncate long responses
+            if self._log_file:
+                self._log_file.flush()
             
             return response
             
@@ -133,144 +165,173 @@ class ChatSession:
             logger.error(f"Error sending command: {e}")
             return ""
     
+    @staticmethod
+    def _pump(stream, lines: "queue.Queue[Optional[str]]") -> None:
+        """Copy lines from a pipe into a queue until EOF, then enqueue None."""
+        for line in iter(stream.readline, ""):
+            lines.put(line)
+        lines.put(None)
+    
+    @staticmethod
+    def _drain(lines: "queue.Queue[Optional[str]]") -> List[str]:
+        """Take every line currently in a queue without waiting."""
+        drained = []
+        while True:
+            try:
+                line = lines.get_nowait()
+            except queue.Empty:
+                return drained
+            if line is not None:
+                drained.append(line)
+    
+    def _await_welcome(self, timeout: float) -> bool:
+        """Wait for the welcome message, returning False on timeout or EOF."""
+        parts: List[str] = []
+        deadline = time.monotonic() + timeout
+        found = False
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            try:
+                line = self._stdout_lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            
+            if line is None:
+                # stdout is closed; keep the marker for later reads
+                self._stdout_lines.put(None)
+                break
+            parts.append(line)
+            
+            if "Welcome" in line or "How can I help" in line:
+                found = True
+                break
+        
+        output = "".join(parts)
+        if self._log_file and output:
+            self._log_file.write(f"\n--- COMMAND OUTPUT ---\n{output}\n")
+        self.outputs.append(output)
+        return found
+    
     def _read_output(self, timeout: float) -> str:
         """Read output from the chat session with timeout."""
         if not self.process:
             return ""
         
-        output = ""
-        start_time = time.time()
+        # Collected as a list and joined once, rather than growing a string
+        parts: List[str] = []
+        tail = ""
+        deadline = time.monotonic() + timeout
         
-        # Use non-blocking reads to capture output within timeout
-        while time.time() - start_time < timeout:
-            # Check if process is still running
-            if self.process.poll() is not None:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 break
-                
-            # Try to read a line from stdout
-            line = self._read_nonblocking(self.process.stdout)
-            if line:
-                output += line
-                
-            # Also check stderr
-            err_line = self._read_nonblocking(self.process.stderr)
-            if err_line:
-                logger.warning(f"Error output: {err_line}")
-                
-            # Small delay to avoid high CPU usage
-            time.sleep(0.1)
             
-            # Check for "end of conversation" markers
-            if output and any(marker in output for marker in [
-                "Human: ", "USER: ", "You: ", "> ", ">> "
-            ]):
+            # Wake up as soon as the stdout pump delivers a line
+            try:
+                line = self._stdout_lines.get(timeout=remaining)
+            except queue.Empty:
+                break
+            
+            if line is None:
+                # stdout is closed; keep the marker for later reads
+                self._stdout_lines.put(None)
+                break
+            parts.append(line)
+            
+            # Check for "end of conversation" markers in the new line plus
+            # just enough of the earlier output to catch a marker split
+            # across lines, instead of rescanning everything read so far
+            window = tail + line
+            if any(marker in window for marker in _PROMPT_MARKERS):
                 # Found prompt for next input, stop reading
                 break
+            tail = window[-_PROMPT_TAIL_LEN:]
+        
+        output = "".join(parts)
+        
+        for err_line in self._drain(self._stderr_lines):
+            logger.warning(f"Error output: {err_line}")
         
         # Log complete output to file
-        if self.log_path and output:
-            with open(self.log_path, 'a') as log_file:
-                log_file.write(f"\n--- COMMAND OUTPUT ---\n{output}\n")
+        if self._log_file and output:
+            self._log_file.write(f"\n--- COMMAND OUTPUT ---\n{output}\n")
         
         self.outputs.append(output)
         return output
     
-    def _read_nonblocking(self, stream) -> str:
-        """Non-blocking read from a stream."""
-        import select
-        
-        if not stream:
-            return ""
-            
-        output = ""
-        # Use select to check if there's data to read
-        r, _, _ = select.select([stream], [], [], 0)
-        if stream in r:
-            # There's data to read
-            line = stream.readline()
-            if line:
-                output += line
-                
-        return output
-    
     def stop(self) -> None:
         """Stop the chat session."""
-        if self.process and self.process.poll() is None:
-            logger.info("Stopping chat session")
-            
-            try:
-                # Try to exit gracefully
-                self.process.stdin.write("/exit\n")
-                self.process.stdin.flush()
-                
-                # Give it a moment to exit
-                time.sleep(1)
+        try:
+            if self.process and self.process.poll() is None:
+                logger.info("Stopping chat session")
                 
-                # If still running, terminate
-                if self.process.poll() is None:
-                    self.process.terminate()
-                    self.process.wait(timeout=5)
-                    
-            except Exception as e:
-                logger.error(f"Error stopping chat session: {e}")
-                # Force kill if needed
-                if self.process.poll() is None:
-                    self.process.kill()
-            
-            # Log final output
-            if self.log_path:
                 try:
-                    final_stdout = self.process.stdout.read() if self.process.stdout else ""
-                    final_stderr = self.process.stderr.read() if self.process.stderr else ""
+                    # Try to exit gracefully
+                    self.process.stdin.write("/exit\n")
+                    self.process.stdin.flush()
+                    
+                    # Give it a moment to exit
+                    time.sleep(1)
                     
-                    with open(self.log_path, 'a') as log_file:
-                        log_file.write(f"\n--- FINAL OUTPUT ---\nSTDOUT:\n{final_stdout}\nSTDERR:\n{final_stderr}\n")
+                    # If still running, terminate
+                    if self.process.poll() is None:
+                        self.process.terminate()
+                        self.process.wait(timeout=5)
                         
                 except Exception as e:
-                    logger.error(f"Error logging final output: {e}")
-        
-        self.process = None
+                    logger.error(f"Error stopping chat session: {e}")
+                    # Force kill if needed
+                    if self.process.poll() is None:
+                        self.process.kill()
+                
+                # Log final output
+                if self._log_file:
+                    try:
+                        # The pumps hit EOF once the process has exited
+                        for pump in self._pumps:
+                            pump.join(timeout=1)
+                        final_stdout = "".join(self._drain(self._stdout_lines))
+                        final_stderr = "".join(self._drain(self._stderr_lines))
+                        
+                        self._log_file.write(f"\n--- FINAL OUTPUT ---\nSTDOUT:\n{final_stdout}\nSTDERR:\n{final_stderr}\n")
+                        
+                    except Exception as e:
+                        logger.error(f"Error logging final output: {e}")
+        finally:
+            # Close our ends of the pipes, so sessions do not leak three file
+            # descriptors each, even if stopping failed
+            if self.process:
+                for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+                    if stream:
+                        try:
+                            stream.close()
+                        except OSError:
+                            # e.g. flushing stdin to a child that already exited
+                            pass
+            self.process = None
+            if self._log_file:
+                self._log_file.close()
+                self._log_file = None
 
 # Skip these tests in CI since they require interactive sessions
 @pytest.mark.skip("Skip in CI - requires interactive mcp-cli chat session")
+@pytest.mark.usefixtures("setup_mcp_cli")
 class TestMcpCliChatMode:
     """Test the mcp-cli in chat mode with the IMAP server."""
     
-    @pytest.fixture(scope="class", autouse=True)
-    def setup_mcp_cli(self):
-        """Ensure MCP CLI dependencies are installed."""
-        # Save current directory
-        original_dir = os.getcwd()
-        
-        try:
-            # Change to mcp-cli directory
-            os.chdir(MCP_CLI_DIR)
-            
-            # Run uv sync --reinstall to ensure dependencies are installed
-            logger.info("Installing/updating MCP CLI dependencies...")
-            subprocess.run(
-                ["uv", "sync", "--reinstall"],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            yield
-        
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to install MCP CLI dependencies: {e}")
-            pytest.skip("Failed to install MCP CLI dependencies")
-        
-        finally:
-            # Return to original directory
-            os.chdir(original_dir)
-    
     @pytest.fixture(scope="function")
-    def chat_session(self):
+    def chat_session(self, tmp_path):
         """Initialize and tear down a chat session for each test."""
-        session = ChatSession(server="imap")
+        session = ChatSession(server="imap", log_dir=tmp_path)
         
         if not session.start():
+            # Release the pipes and log file of the failed start
+            session.stop()
             pytest.skip("Failed to start chat session")
         
         yield session
@@ -306,19 +367,7 @@ class TestMcpCliChatMode:
         
         # Check if the response contains the expected structure
         # (either a formatted table, a list, or a message about no unread emails)
-        table_patterns = [
-            r"(\+[-+]+\+)|(│.*│)",  # ASCII table patterns
-            r"(\|.*\|)",  # Simple pipe-based table
-            r"^(\s*\d+\.\s+.*subject.*from.*date)",  # Numbered list with headers
-            r"(no unread emails|inbox is empty)",  # No emails message
-        ]
-        
-        pattern_found = False
-        for pattern in table_patterns:
-            if re.search(pattern, response, re.IGNORECASE | re.MULTILINE):
-                pattern_found = True
-                break
-                
+        pattern_found = any(pattern.search(response) for pattern in _TABLE_PATTERNS)
         assert pattern_found, "Response doesn't contain expected email list format"
     
     def test_email_pagination(self, chat_session):
@@ -354,14 +403,14 @@ class TestMcpCliChatMode:
         # Verify response contains email information or appropriate message
         assert "list_unread_emails" in response, "Tool name not found in response"
         
-        # Look for JSON-formatted response in the output
-        json_pattern = r'({.*})'
-        json_matches = re.findall(json_pattern, response, re.DOTALL)
+        # Look for JSON-formatted response in the output, decoding forward
+        # from the first brace rather than backtracking over the response
+        json_start = response.find("{")
         
-        if json_matches:
+        if json_start != -1:
             try:
                 # Try to parse the JSON to verify format
-                json_data = json.loads(json_matches[0])
+                json_data, _ = json.JSONDecoder().raw_decode(response, json_start)
                 
                 # Verify expected fields
                 assert "emails" in json_data, "Missing 'emails' field in JSON response"
@@ -373,4 +422,4 @@ class TestMcpCliChatMode:
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse JSON response: {e}")
-                logger.error(f"Raw JSON: {json_matches[0]}")
+                logger.error(f"Raw JSON: {response[json_start:]}")
@@ -2,36 +2,17 @@
 
 import argparse
 import getpass
-import os
 import sys
-import yaml
-import tempfile
 from unittest.mock import patch, mock_open, MagicMock
 import pytest
 
-from imap_mcp.app_password import setup_app_password, main
+from imap_mcp.app_password import _build_parser, setup_app_password, main
 
 
-@pytest.fixture
-def sample_config_file():
-    """Create a temporary config file with test data."""
-    config_data = {
-        "imap": {
-            "server": "imap.gmail.com",
-            "port": 993,
-            "username": "test@gmail.com"
-        }
-    }
-    
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".yaml") as f:
-        yaml.dump(config_data, f)
-        temp_file_path = f.name
-    
-    yield temp_file_path
-    
-    # Clean up
-    if os.path.exists(temp_file_path):
-        os.unlink(temp_file_path)
+@pytest.fixture(scope="class")
+def parser():
+    """Build the app password argument parser once per test class."""
+    return _build_parser()
 
 
 class TestSetupAppPassword:
@@ -166,12 +147,19 @@ class TestSetupAppPassword:
 class TestMain:
     """Tests for the main function."""
     
+    def test_build_parser_defaults(self, parser):
+        """Test the parser's default config input and output paths."""
+        args = parser.parse_args([])
+        
+        assert args.config is None
+        assert args.output == "config.yaml"
+    
     @pytest.mark.skip(reason="Test interrupts automated execution to ask for password in command line")
     @pytest.mark.skip(reason="Skipping test that requires real credentials")
     @patch("imap_mcp.app_password.setup_app_password")
     @patch("sys.argv")
     @patch("sys.exit")
-    def test_main_success(self, mock_exit, mock_argv, mock_setup):
+    def test_main_success(self, mock_exit, mock_argv, mock_setup, parser):
         """Test successful execution of main function."""
         # Set up mocks
         mock_argv.__getitem__.side_effect = lambda i: [
@@ -186,7 +174,7 @@ class TestMain:
         mock_setup.return_value = {"imap": {"password": "test_password"}}
         
         # Run the main function
-        main()
+        main(parser)
         
         # Verify the setup function was called with the correct arguments
         mock_setup.assert_called_once_with(
@@ -204,7 +192,7 @@ class TestMain:
     @patch("imap_mcp.app_password.setup_app_password")
     @patch("sys.argv")
     @patch("sys.exit")
-    def test_main_with_config(self, mock_exit, mock_argv, mock_setup):
+    def test_main_with_config(self, mock_exit, mock_argv, mock_setup, parser):
         """Test main function with config file."""
         # Set up mocks
         mock_argv.__getitem__.side_effect = lambda i: [
@@ -217,7 +205,7 @@ class TestMain:
         mock_setup.return_value = {"imap": {"password": "test_password"}}
         
         # Run the main function
-        main()
+        main(parser)
         
         # Verify the setup function was called with the correct arguments
         mock_setup.assert_called_once_with(
@@ -233,7 +221,7 @@ class TestMain:
     @patch("imap_mcp.app_password.setup_app_password")
     @patch("sys.argv")
     @patch("sys.exit")
-    def test_main_error(self, mock_exit, mock_argv, mock_setup):
+    def test_main_error(self, mock_exit, mock_argv, mock_setup, parser):
         """Test main function with setup error."""
         # Set up mocks
         mock_argv.__getitem__.side_effect = lambda i: [
@@ -245,7 +233,7 @@ class TestMain:
         mock_setup.side_effect = ValueError("Test error")
         
         # Run the main function
-        main()
+        main(parser)
         
         # Verify the program exits with error
         mock_exit.assert_called_once_with(1)
@@ -254,7 +242,7 @@ class TestMain:
     @patch("imap_mcp.app_password.setup_app_password")
     @patch("argparse.ArgumentParser.parse_args")
     @patch("sys.exit")
-    def test_main_argument_parsing(self, mock_exit, mock_parse_args, mock_setup):
+    def test_main_argument_parsing(self, mock_exit, mock_parse_args, mock_setup, parser):
         """Test argument parsing in main function."""
         # Set up mock
         mock_args = argparse.Namespace(
@@ -268,7 +256,7 @@ class TestMain:
         mock_setup.return_value = {"imap": {"password": "test_password"}}
         
         # Run the main function
-        main()
+        main(parser)
         
         # Verify argument parser was called
         mock_parse_args.assert_called_once()
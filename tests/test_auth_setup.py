@@ -1,62 +1,12 @@
 """Tests for the auth_setup module."""
 
 import argparse
-import json
-import os
-import tempfile
-import yaml
 from unittest.mock import patch, mock_open, MagicMock
 import pytest
 
 from imap_mcp.auth_setup import setup_gmail_oauth2, main
 
 
-@pytest.fixture
-def sample_config_file():
-    """Create a temporary config file with test data."""
-    config_data = {
-        "imap": {
-            "server": "imap.gmail.com",
-            "port": 993,
-            "username": "test@gmail.com"
-        }
-    }
-    
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".yaml") as f:
-        yaml.dump(config_data, f)
-        temp_file_path = f.name
-    
-    yield temp_file_path
-    
-    # Clean up
-    if os.path.exists(temp_file_path):
-        os.unlink(temp_file_path)
-
-
-@pytest.fixture
-def sample_credentials_file():
-    """Create a temporary credentials file with test data."""
-    credentials_data = {
-        "installed": {
-            "client_id": "test_client_id.apps.googleusercontent.com",
-            "client_secret": "test_client_secret",
-            "redirect_uris": ["http://localhost", "urn:ietf:wg:oauth:2.0:oob"],
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-        }
-    }
-    
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
-        json.dump(credentials_data, f)
-        temp_file_path = f.name
-    
-    yield temp_file_path
-    
-    # Clean up
-    if os.path.exists(temp_file_path):
-        os.unlink(temp_file_path)
-
-
 class TestSetupGmailOAuth2:
     """Tests for the setup_gmail_oauth2 function."""
     
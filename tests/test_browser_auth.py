@@ -1,9 +1,7 @@
 """Tests for the browser-based OAuth2 authentication module."""
 
 import json
-import os
 import secrets
-import tempfile
 import time
 import webbrowser
 from unittest.mock import patch, MagicMock, call
@@ -22,30 +20,6 @@ from imap_mcp.browser_auth import (
 )
 
 
-@pytest.fixture
-def sample_credentials_file():
-    """Create a temporary credentials file with test data."""
-    credentials_data = {
-        "installed": {
-            "client_id": "test_client_id.apps.googleusercontent.com",
-            "client_secret": "test_client_secret",
-            "redirect_uris": ["http://localhost", "urn:ietf:wg:oauth:2.0:oob"],
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-        }
-    }
-    
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
-        json.dump(credentials_data, f)
-        temp_file_path = f.name
-    
-    yield temp_file_path
-    
-    # Clean up
-    if os.path.exists(temp_file_path):
-        os.unlink(temp_file_path)
-
-
 class TestCreateOAuthApp:
     """Tests for create_oauth_app function."""
     
@@ -75,31 +49,21 @@ class TestLoadClientCredentials:
         with pytest.raises(FileNotFoundError):
             load_client_credentials("nonexistent_file.json")
     
-    def test_load_client_credentials_invalid_json(self):
+    def test_load_client_credentials_invalid_json(self, tmp_path):
         """Test error when credentials file contains invalid JSON."""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
-            f.write("invalid json content")
-            temp_file_path = f.name
+        credentials_path = tmp_path / "credentials.json"
+        credentials_path.write_text("invalid json content")
         
-        try:
-            with pytest.raises((json.JSONDecodeError, ValueError)):
-                load_client_credentials(temp_file_path)
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        with pytest.raises((json.JSONDecodeError, ValueError)):
+            load_client_credentials(str(credentials_path))
     
-    def test_load_client_credentials_missing_fields(self):
+    def test_load_client_credentials_missing_fields(self, tmp_path):
         """Test error when credentials file is missing required fields."""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json") as f:
-            json.dump({"installed": {"missing": "required fields"}}, f)
-            temp_file_path = f.name
+        credentials_path = tmp_path / "credentials.json"
+        credentials_path.write_text(json.dumps({"installed": {"missing": "required fields"}}))
         
-        try:
-            with pytest.raises(ValueError):
-                load_client_credentials(temp_file_path)
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        with pytest.raises(ValueError):
+            load_client_credentials(str(credentials_path))
 
 
 class TestRunLocalServer:
@@ -1,5 +1,8 @@
 """Tests for the IMAP client."""
 
+import ssl
+
+import imapclient
 import pytest
 from unittest.mock import patch
 
@@ -63,6 +66,51 @@ class TestImapClient:
             assert client.connected is True
             assert client.client is mock_imap_client
 
+    def test_connect_with_ssl_context(self, mock_imap_client):
+        """Test that a provided SSL context is passed to IMAPClient."""
+        config = ImapConfig(
+            host="imap.example.com",
+            port=993,
+            username="test@example.com",
+            password="password",
+            use_ssl=True,
+        )
+        ssl_context = ssl.create_default_context()
+        client = ImapClient(config, ssl_context=ssl_context)
+        
+        with patch("imapclient.IMAPClient") as mock_client_class:
+            mock_client_class.return_value = mock_imap_client
+            client.connect()
+            
+            mock_client_class.assert_called_once_with(
+                "imap.example.com",
+                port=993,
+                ssl=True,
+                ssl_context=ssl_context
+            )
+
+    def test_connect_with_timeout(self, mock_imap_client):
+        """Test that a connect timeout is passed to IMAPClient."""
+        config = ImapConfig(
+            host="imap.example.com",
+            port=993,
+            username="test@example.com",
+            password="password",
+            use_ssl=True,
+        )
+        client = ImapClient(config)
+        
+        with patch("imapclient.IMAPClient") as mock_client_class:
+            mock_client_class.return_value = mock_imap_client
+            client.connect(timeout=5)
+            
+            mock_client_class.assert_called_once_with(
+                "imap.example.com",
+                port=993,
+                ssl=True,
+                timeout=5
+            )
+
     def test_connect_failure(self):
         """Test connection failure."""
         config = ImapConfig(
@@ -344,6 +392,7 @@ class TestImapClient:
             
             # Verify result is correct
             assert result == {b"EXISTS": 10}
+            assert client.last_select_response == {b"EXISTS": 10}
             
             # Also test with readonly=True
             mock_imap_client.select_folder.reset_mock()
@@ -382,6 +431,58 @@ class TestImapClient:
             # Verify select_folder was not called
             mock_imap_client.select_folder.assert_not_called()
 
+    def test_get_folder_counts(self, mock_imap_client):
+        """Test getting message counts from a single cached STATUS."""
+        config = ImapConfig(
+            host="imap.example.com",
+            port=993,
+            username="test@example.com",
+            password="password",
+            use_ssl=True,
+        )
+        client = ImapClient(config)
+        
+        with patch("imapclient.IMAPClient") as mock_client_class:
+            mock_client_class.return_value = mock_imap_client
+            mock_imap_client.folder_status.return_value = {b"MESSAGES": 10, b"UNSEEN": 3}
+            
+            client.connect()
+            
+            # First call issues one STATUS for all counts
+            assert client.get_folder_counts("INBOX") == (10, 3, 7)
+            mock_imap_client.folder_status.assert_called_once_with("INBOX", [b"MESSAGES", b"UNSEEN"])
+            
+            # Second call is served from the cache
+            mock_imap_client.folder_status.return_value = {b"MESSAGES": 11, b"UNSEEN": 4}
+            assert client.get_folder_counts("INBOX") == (10, 3, 7)
+            assert mock_imap_client.folder_status.call_count == 1
+            
+            # Refresh queries the server again
+            assert client.get_folder_counts("INBOX", refresh=True) == (11, 4, 7)
+            assert mock_imap_client.folder_status.call_count == 2
+
+    def test_get_folder_counts_error(self, mock_imap_client):
+        """Test that STATUS failures are raised as ConnectionError."""
+        config = ImapConfig(
+            host="imap.example.com",
+            port=993,
+            username="test@example.com",
+            password="password",
+            use_ssl=True,
+        )
+        client = ImapClient(config)
+        
+        with patch("imapclient.IMAPClient") as mock_client_class:
+            mock_client_class.return_value = mock_imap_client
+            mock_imap_client.folder_status.side_effect = imapclient.exceptions.IMAPClientError("STATUS failed")
+            
+            client.connect()
+            
+            with pytest.raises(ConnectionError) as excinfo:
+                client.get_folder_counts("INBOX")
+            assert isinstance(excinfo.value.__cause__, imapclient.exceptions.IMAPClientError)
+            assert "INBOX" not in client.count_cache
+
     def test_search_with_string_criteria(self, mock_imap_client):
         """Test searching with string criteria."""
         config = ImapConfig(
@@ -253,6 +253,22 @@ class TestFixtures:
         subject_header = test_email_message_encoded_headers["Subject"]
         assert "=?utf-8?" in subject_header
 
+    def test_test_email_bytes(self, test_email_bytes_simple, test_email_bytes_multipart):
+        """Test the raw email bytes fixtures."""
+        simple = email.message_from_bytes(test_email_bytes_simple)
+        assert simple["Subject"] == "Simple Test Email"
+        assert simple["Message-ID"] == "<simple-test-123@example.com>"
+        assert simple.get_payload() == "This is a simple test email."
+        
+        multipart = email.message_from_bytes(test_email_bytes_multipart)
+        assert multipart["Subject"] == "Multipart Test Email"
+        assert multipart.is_multipart()
+        parts = multipart.get_payload()
+        assert len(parts) == 2
+        assert parts[0].get_content_type() == "text/plain"
+        assert parts[1].get_content_type() == "text/html"
+        assert parts[1].get_payload() == "<p>This is the <b>HTML</b> content.</p>"
+
     def test_make_test_email_message(self, make_test_email_message):
         """Test the factory fixture for creating email messages."""
         # Test with default parameters
@@ -291,6 +307,26 @@ class TestFixtures:
         assert "text/plain" in parts[2].get_content_type() or parts[2].get_content_type() == "application/octet-stream"
         assert "test.txt" in parts[2].get("Content-Disposition", "")
 
+    def test_make_test_email_message_cached(self, make_test_email_message):
+        """Test that identical factory calls return independent copies."""
+        first = make_test_email_message(subject="Cached", body_html="<p>Cached</p>")
+        second = make_test_email_message(subject="Cached", body_html="<p>Cached</p>")
+        
+        assert first is not second
+        assert first["Message-ID"] != second["Message-ID"]
+        assert first["Subject"] == second["Subject"]
+        
+        # Modifying one copy leaves later copies untouched
+        first.replace_header("Subject", "Changed")
+        first.get_payload()[0].set_payload("Changed body")
+        third = make_test_email_message(subject="Cached", body_html="<p>Cached</p>")
+        assert third["Subject"] == "Cached"
+        assert third.get_payload()[0].get_payload() == "This is a test email."
+        
+        # An explicit Message-ID is kept
+        custom = make_test_email_message(subject="Cached", message_id="<custom@example.com>")
+        assert custom["Message-ID"] == "<custom@example.com>"
+
     def test_test_email_response_data(self, test_email_response_data):
         """Test the IMAP email response data fixture."""
         assert test_email_response_data is not None
@@ -2,7 +2,10 @@
 Tests for the tasks_to_issues_cli.py script that migrates tasks from TASKS.md to GitHub Issues using GitHub CLI.
 """
 
+import io
+import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, mock_open
 from pathlib import Path
@@ -25,12 +28,12 @@ class TestRunCommand(unittest.TestCase):
         mock_subprocess_run.return_value = mock_result
         
         # Call the function
-        result = cli.run_command("gh --version")
+        result = cli.run_command(["gh", "--version"])
         
         # Verify
         self.assertEqual(result, "Command output")
         mock_subprocess_run.assert_called_once_with(
-            "gh --version", shell=True, text=True, capture_output=True
+            ["gh", "--version"], text=True, capture_output=True
         )
     
     def test_failed_command(self, mock_subprocess_run):
@@ -42,55 +45,81 @@ class TestRunCommand(unittest.TestCase):
         mock_subprocess_run.return_value = mock_result
         
         # Call the function
-        result = cli.run_command("gh invalid")
+        result = cli.run_command(["gh", "invalid"])
         
         # Verify
         self.assertIsNone(result)
         mock_subprocess_run.assert_called_once()
+    
+    def test_missing_executable(self, mock_subprocess_run):
+        """Test handling a command whose executable is not installed."""
+        mock_subprocess_run.side_effect = FileNotFoundError("gh")
+        
+        result = cli.run_command(["gh", "--version"])
+        
+        self.assertIsNone(result)
 
 
 class TestCreateRequiredLabels(unittest.TestCase):
     """Test the create_required_labels function."""
     
-    @patch('tasks_to_issues_cli.run_command')
-    def test_create_labels(self, mock_run_command):
+    def test_create_labels(self):
         """Test creating GitHub labels."""
-        # Setup mock
-        mock_run_command.return_value = "Label created"
+        # Setup mock session
+        mock_session = MagicMock()
+        mock_session.post.return_value = MagicMock(status_code=201)
         
         # Call the function
-        cli.create_required_labels()
+        result = cli.create_required_labels((mock_session, "owner/repo"))
         
         # Verify
+        self.assertTrue(result)
         # Should be called for each status label (5) and priority labels (20)
         expected_calls = 25
-        self.assertEqual(mock_run_command.call_count, expected_calls)
-        
-        # Check content of some calls
-        calls = mock_run_command.call_args_list
+        self.assertEqual(mock_session.post.call_count, expected_calls)
         
-        # Check for status:prioritized label
-        found_status_prioritized = False
+        # All labels go to the repository labels endpoint
+        calls = mock_session.post.call_args_list
         for call in calls:
-            cmd = call[0][0]
-            if "status:prioritized" in cmd and "0075ca" in cmd:
-                found_status_prioritized = True
-                break
-        self.assertTrue(found_status_prioritized, "status:prioritized label creation not found")
-        
-        # Check for a priority label
-        found_priority_label = False
-        for call in calls:
-            cmd = call[0][0]
-            if "priority:1" in cmd and "d93f0b" in cmd:
-                found_priority_label = True
-                break
-        self.assertTrue(found_priority_label, "priority:1 label creation not found")
+            self.assertEqual(call[0][0], "https://api.github.com/repos/owner/repo/labels")
+        
+        # Check for status:prioritized and priority:1 labels
+        labels = [call[1]['json'] for call in calls]
+        self.assertIn(
+            {"name": "status:prioritized", "color": "0075ca", "description": "Task is prioritized but not started"},
+            labels
+        )
+        self.assertIn(
+            {"name": "priority:1", "color": "d93f0b", "description": "Priority level 1"},
+            labels
+        )
+    
+    def test_create_labels_already_exist(self):
+        """Test that existing labels (HTTP 422) are treated as success."""
+        mock_session = MagicMock()
+        mock_session.post.return_value = MagicMock(status_code=422)
+        
+        result = cli.create_required_labels((mock_session, "owner/repo"))
+        
+        self.assertTrue(result)
+    
+    @patch('tasks_to_issues_cli.create_github_session')
+    def test_create_labels_no_session(self, mock_create_session):
+        """Test label creation when gh is not authenticated."""
+        mock_create_session.return_value = None
+        
+        result = cli.create_required_labels()
+        
+        self.assertFalse(result)
 
 
 class TestParseTasks(unittest.TestCase):
     """Test the parse_tasks function."""
     
+    def setUp(self):
+        """Start every test with an empty parse cache."""
+        cli._parse_tasks_cached.cache_clear()
+    
     def test_parse_tasks_valid_content(self):
         """Test parsing tasks from valid TASKS.md content."""
         # Mock content for TASKS.md
@@ -170,44 +199,303 @@ Implement the OAuth2 flow for Gmail:
                 self.assertIn('description', task)
 
 
-class TestCreateIssueWithGh(unittest.TestCase):
-    """Test the create_issue_with_gh function."""
+    def test_parse_tasks_stops_at_table_end(self):
+        """Test that only rows of the task table are parsed."""
+        mock_content = """
+| Priority | Task # | Status      | Description                                      |
+|----------|--------|-------------|--------------------------------------------------|
+| 2        | 30     | prioritized | Task inside the table                            |
+
+| 1        | 31     | prioritized | Row-like line after the table                    |
+"""
+        
+        with patch('builtins.open', mock_open(read_data=mock_content)):
+            tasks = cli.parse_tasks()
+        
+        self.assertEqual([task['task_number'] for task in tasks], [30])
     
-    @patch('tasks_to_issues_cli.run_command')
-    def test_create_issue(self, mock_run_command):
-        """Test creating an issue with GitHub CLI."""
-        # Setup mock
-        mock_run_command.return_value = "Created issue #42"
-        
-        # Create a sample task
-        task = {
-            'task_number': 21,
-            'priority': 5,
-            'status': 'prioritized',
-            'description': 'Implement Gmail OAuth2 Authentication Flow'
+    def test_parse_tasks_no_table(self):
+        """Test parsing a file without a task table."""
+        with patch('builtins.open', mock_open(read_data="# Tasks\n\nNothing here\n")):
+            with patch('sys.stdout'):
+                tasks = cli.parse_tasks()
+        
+        self.assertEqual(tasks, [])
+
+
+    def test_parse_tasks_cached_until_file_changes(self):
+        """Test that an unchanged file is only parsed once."""
+        table = (
+            "| Priority | Task # | Status      | Description |\n"
+            "|----------|--------|-------------|-------------|\n"
+            "| 2        | 30     | prioritized | First task  |\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tasks_file = os.path.join(tmp_dir, "TASKS.md")
+            with open(tasks_file, "w") as f:
+                f.write(table)
+            
+            with patch('tasks_to_issues_cli.read_tasks', wraps=cli.read_tasks) as mock_read:
+                first = cli.parse_tasks(tasks_file)
+                second = cli.parse_tasks(tasks_file)
+                self.assertEqual(mock_read.call_count, 1)
+                self.assertEqual(first, second)
+                
+                # Mutating a result must not leak into the cache
+                first[0]['description'] = "changed"
+                self.assertEqual(cli.parse_tasks(tasks_file)[0]['description'], "First task")
+                
+                # A changed file is parsed again
+                with open(tasks_file, "a") as f:
+                    f.write("| 1        | 31     | prioritized | Second task |\n")
+                third = cli.parse_tasks(tasks_file)
+                self.assertEqual(mock_read.call_count, 2)
+                self.assertEqual([task['task_number'] for task in third], [31, 30])
+
+
+class TestGraphqlRequest(unittest.TestCase):
+    """Test rate limit handling in graphql_request."""
+    
+    def make_response(self, status_code, headers=None, data=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.json.return_value = {"data": data}
+        return response
+    
+    @patch('tasks_to_issues_cli.time.sleep')
+    def test_retries_after_secondary_rate_limit(self, mock_sleep):
+        """Test that a 403 with Retry-After is retried after the given delay."""
+        session = MagicMock()
+        session.post.side_effect = [
+            self.make_response(403, {"Retry-After": "7"}),
+            self.make_response(200, data={"ok": True}),
+        ]
+        
+        with patch('sys.stdout'):
+            data = cli.graphql_request(session, "query", {})
+        
+        self.assertEqual(data, {"ok": True})
+        self.assertEqual(session.post.call_count, 2)
+        mock_sleep.assert_called_once_with(7.0)
+    
+    @patch('tasks_to_issues_cli.time.sleep')
+    def test_backs_off_without_retry_after(self, mock_sleep):
+        """Test that 429 responses back off exponentially and give up eventually."""
+        session = MagicMock()
+        session.post.return_value = self.make_response(429)
+        
+        with patch('sys.stdout'):
+            data = cli.graphql_request(session, "query", {})
+        
+        self.assertIsNone(data)
+        self.assertEqual(session.post.call_count, cli.MAX_RATE_LIMIT_RETRIES + 1)
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        self.assertEqual(delays, [cli.RATE_LIMIT_BACKOFF * 2 ** n for n in range(cli.MAX_RATE_LIMIT_RETRIES)])
+    
+    @patch('tasks_to_issues_cli.time.sleep')
+    def test_permission_error_not_retried(self, mock_sleep):
+        """Test that a 403 without rate limit headers fails immediately."""
+        session = MagicMock()
+        response = self.make_response(403)
+        response.raise_for_status.side_effect = cli.requests.HTTPError("403 Forbidden")
+        session.post.return_value = response
+        
+        with patch('sys.stdout'):
+            data = cli.graphql_request(session, "query", {})
+        
+        self.assertIsNone(data)
+        session.post.assert_called_once()
+        mock_sleep.assert_not_called()
+    
+    @patch('tasks_to_issues_cli.time.sleep')
+    @patch('tasks_to_issues_cli.time.monotonic', return_value=100.0)
+    def test_pacer_spaces_requests(self, mock_monotonic, mock_sleep):
+        """Test that the pacer delays each request by the interval."""
+        pacer = cli.RequestPacer(1.5)
+        pacer.wait()
+        pacer.wait()
+        pacer.wait()
+        
+        delays = [call[0][0] for call in mock_sleep.call_args_list]
+        self.assertEqual(delays, [1.5, 3.0])
+
+
+class TestBulkCreateIssues(unittest.TestCase):
+    """Test the bulk_create_issues function."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tasks = [
+            {
+                'task_number': 21,
+                'priority': 5,
+                'status': 'prioritized',
+                'description': 'Implement Gmail OAuth2 Authentication Flow'
+            },
+            {
+                'task_number': 22,
+                'priority': 3,
+                'status': 'prioritized',
+                'description': 'Implement Secure Token Storage'
+            }
+        ]
+        repository_response = MagicMock()
+        repository_response.json.return_value = {
+            "data": {
+                "repository": {
+                    "id": "R_1",
+                    "labels": {"nodes": [
+                        {"id": "L_p5", "name": "priority:5"},
+                        {"id": "L_p3", "name": "priority:3"},
+                        {"id": "L_sp", "name": "status:prioritized"},
+                    ], "pageInfo": {"hasNextPage": False, "endCursor": "C_1"}}
+                }
+            }
+        }
+        mutation_response = MagicMock()
+        mutation_response.json.return_value = {
+            "data": {
+                "i0": {"issue": {"number": 1, "url": "https://github.com/owner/repo/issues/1"}},
+                "i1": {"issue": {"number": 2, "url": "https://github.com/owner/repo/issues/2"}},
+            }
         }
+        self.mock_session = MagicMock()
+        self.mock_session.post.return_value = repository_response
         
-        # Call the function
-        result = cli.create_issue_with_gh(task)
+        # Worker threads post mutations through their own sessions
+        self.worker_sessions = []
+        self.worker_post = lambda url, json: mutation_response
         
-        # Verify
-        self.assertTrue(result)
-        mock_run_command.assert_called_once()
-        
-        # Check command contains expected elements
-        cmd = mock_run_command.call_args[0][0]
-        self.assertIn('gh issue create', cmd)
-        self.assertIn('--title', cmd)
-        self.assertIn('Implement Gmail OAuth2 Authentication Flow', cmd)
-        self.assertIn('--body', cmd)
-        self.assertIn('--label "priority:5"', cmd)
-        self.assertIn('--label "status:prioritized"', cmd)
+        def make_session():
+            worker_session = MagicMock()
+            worker_session.post.side_effect = lambda url, json: self.worker_post(url, json)
+            self.worker_sessions.append(worker_session)
+            return worker_session
+        
+        session_patcher = patch('tasks_to_issues_cli.requests.Session', side_effect=make_session)
+        session_patcher.start()
+        self.addCleanup(session_patcher.stop)
+    
+    def test_bulk_create_issues(self):
+        """Test that all issues are created with a single mutation."""
+        with patch('sys.stdout'):
+            created = cli.bulk_create_issues(self.tasks, (self.mock_session, "owner/repo"))
+        
+        self.assertEqual(created, 2)
+        # One query for repository/label IDs, one mutation for all issues
+        self.mock_session.post.assert_called_once()
+        self.assertEqual(len(self.worker_sessions), 1)
+        worker_session = self.worker_sessions[0]
+        worker_session.post.assert_called_once()
+        
+        # The worker session carries the caller's auth headers and is closed afterwards
+        worker_session.headers.update.assert_called_once_with(self.mock_session.headers)
+        worker_session.close.assert_called_once()
+        
+        payload = worker_session.post.call_args[1]['json']
+        self.assertIn('i0: createIssue(input: $i0)', payload['query'])
+        self.assertIn('i1: createIssue(input: $i1)', payload['query'])
+        self.assertEqual(payload['variables']['i0']['repositoryId'], "R_1")
+        self.assertEqual(payload['variables']['i0']['title'], "Task #21: Implement Gmail OAuth2 Authentication Flow")
+        self.assertEqual(payload['variables']['i0']['labelIds'], ["L_p5", "L_sp"])
+        self.assertEqual(payload['variables']['i1']['labelIds'], ["L_p3", "L_sp"])
+    
+    def test_bulk_create_issues_in_batches(self):
+        """Test that large task lists are split across several mutations."""
+        repository = {"data": {"repository": {"id": "R_1", "labels": {
+            "nodes": [], "pageInfo": {"hasNextPage": False, "endCursor": None}
+        }}}}
+        
+        def post(url, json):
+            response = MagicMock()
+            if 'createIssue' in json['query']:
+                response.json.return_value = {
+                    "data": {
+                        alias: {"issue": {"number": 1, "url": "https://github.com/owner/repo/issues/1"}}
+                        for alias in json['variables']
+                    }
+                }
+            else:
+                response.json.return_value = repository
+            return response
+        
+        self.mock_session.post.side_effect = post
+        self.worker_post = post
+        
+        with patch.object(cli, 'ISSUE_BATCH_SIZE', 1), patch.object(cli, 'MUTATION_INTERVAL', 0), \
+                patch('sys.stdout'):
+            created = cli.bulk_create_issues(self.tasks, (self.mock_session, "owner/repo"))
+        
+        self.assertEqual(created, 2)
+        # One repository query on the caller's session plus one mutation per
+        # batch, each sent through a worker thread's own session
+        self.mock_session.post.assert_called_once()
+        self.assertEqual(sum(worker.post.call_count for worker in self.worker_sessions), 2)
+        for worker_session in self.worker_sessions:
+            worker_session.close.assert_called_once()
+    
+    def test_bulk_create_issues_warns_about_missing_labels(self):
+        """Test that labels missing from the repository are reported."""
+        repository_response = MagicMock()
+        repository_response.json.return_value = {"data": {"repository": {"id": "R_1", "labels": {
+            "nodes": [{"id": "L_p5", "name": "priority:5"}],
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+        }}}}
+        self.mock_session.post.return_value = repository_response
+        
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            created = cli.bulk_create_issues(self.tasks[:1], (self.mock_session, "owner/repo"))
+        
+        self.assertEqual(created, 1)
+        self.assertIn("task #21 is missing label(s) status:prioritized", stdout.getvalue())
+        payload = self.worker_sessions[0].post.call_args[1]['json']
+        self.assertEqual(payload['variables']['i0']['labelIds'], ["L_p5"])
+    
+    def test_bulk_create_issues_paginates_labels(self):
+        """Test that labels past the first page are resolved."""
+        pages = [
+            {"nodes": [{"id": "L_p5", "name": "priority:5"}],
+             "pageInfo": {"hasNextPage": True, "endCursor": "C_1"}},
+            {"nodes": [{"id": "L_sp", "name": "status:prioritized"}],
+             "pageInfo": {"hasNextPage": False, "endCursor": "C_2"}},
+        ]
+        responses = []
+        for labels in pages:
+            response = MagicMock()
+            response.json.return_value = {"data": {"repository": {"id": "R_1", "labels": labels}}}
+            responses.append(response)
+        self.mock_session.post.side_effect = responses
+        
+        with patch('sys.stdout'):
+            created = cli.bulk_create_issues(self.tasks[:1], (self.mock_session, "owner/repo"))
+        
+        self.assertEqual(created, 1)
+        cursors = [call[1]['json']['variables']['cursor'] for call in self.mock_session.post.call_args_list]
+        self.assertEqual(cursors, [None, "C_1"])
+        
+        payload = self.worker_sessions[0].post.call_args[1]['json']
+        self.assertEqual(payload['variables']['i0']['labelIds'], ["L_p5", "L_sp"])
+    
+    def test_bulk_create_issues_empty(self):
+        """Test that no requests are made without tasks."""
+        created = cli.bulk_create_issues([], (self.mock_session, "owner/repo"))
+        
+        self.assertEqual(created, 0)
+        self.mock_session.post.assert_not_called()
 
 
 class TestMainFunction(unittest.TestCase):
     """Test the main function."""
     
-    @patch('tasks_to_issues_cli.create_issue_with_gh')
+    def setUp(self):
+        """Stub out the GitHub API session."""
+        session_patcher = patch('tasks_to_issues_cli.create_github_session')
+        self.mock_create_session = session_patcher.start()
+        self.mock_create_session.return_value = (MagicMock(), "owner/repo")
+        self.addCleanup(session_patcher.stop)
+    
+    @patch('tasks_to_issues_cli.bulk_create_issues')
     @patch('tasks_to_issues_cli.parse_tasks')
     @patch('tasks_to_issues_cli.create_required_labels')
     @patch('argparse.ArgumentParser.parse_args')
@@ -240,11 +528,12 @@ class TestMainFunction(unittest.TestCase):
             cli.main()
         
         # Verify
+        self.mock_create_session.assert_not_called()  # No API access in dry run mode
         mock_create_labels.assert_not_called()  # Should not create labels in dry run mode
         mock_parse_tasks.assert_called_once()
         mock_create_issue.assert_not_called()  # Should not create issues in dry run
     
-    @patch('tasks_to_issues_cli.create_issue_with_gh')
+    @patch('tasks_to_issues_cli.bulk_create_issues')
     @patch('tasks_to_issues_cli.parse_tasks')
     @patch('tasks_to_issues_cli.create_required_labels')
     @patch('argparse.ArgumentParser.parse_args')
@@ -272,18 +561,21 @@ class TestMainFunction(unittest.TestCase):
             }
         ]
         
-        mock_create_issue.return_value = True
+        mock_create_issue.return_value = 2
         
         # Call the function
         with patch('sys.stdout'):  # Suppress print output for testing
             cli.main()
         
         # Verify
-        mock_create_labels.assert_called_once()
+        github = self.mock_create_session.return_value
+        self.mock_create_session.assert_called_once()  # One session shared by labels and issues
+        mock_create_labels.assert_called_once_with(github)
         mock_parse_tasks.assert_called_once()
-        self.assertEqual(mock_create_issue.call_count, 2)  # Should create both issues
+        # Should create both issues in one batch
+        mock_create_issue.assert_called_once_with(mock_parse_tasks.return_value, github)
     
-    @patch('tasks_to_issues_cli.create_issue_with_gh')
+    @patch('tasks_to_issues_cli.bulk_create_issues')
     @patch('tasks_to_issues_cli.parse_tasks')
     @patch('tasks_to_issues_cli.create_required_labels')
     @patch('argparse.ArgumentParser.parse_args')
@@ -305,7 +597,7 @@ class TestMainFunction(unittest.TestCase):
             }
         ]
         
-        mock_create_issue.return_value = True
+        mock_create_issue.return_value = 1
         
         # Call the function
         with patch('sys.stdout'):  # Suppress print output for testing
@@ -315,6 +607,23 @@ class TestMainFunction(unittest.TestCase):
         mock_create_labels.assert_not_called()  # Should not create labels
         mock_parse_tasks.assert_called_once()
         mock_create_issue.assert_called_once()
+    
+    @patch('tasks_to_issues_cli.parse_tasks')
+    @patch('argparse.ArgumentParser.parse_args')
+    def test_main_function_no_gh_token(self, mock_args, mock_parse_tasks):
+        """Test that main fails early when gh cannot provide a token."""
+        mock_args.return_value = type('Args', (), {
+            'tasks_file': 'TASKS.md',
+            'dry_run': False,
+            'skip_labels': False
+        })
+        self.mock_create_session.return_value = None
+        
+        with patch('sys.stdout'):
+            result = cli.main()
+        
+        self.assertEqual(result, 1)
+        mock_parse_tasks.assert_not_called()
 
 
 if __name__ == "__main__":